@@ -0,0 +1,32 @@
+"""
+Runs the application: `python -m app [--workers N] [--host HOST] [--port PORT]`.
+Defaults come from the SERVER_* settings.
+"""
+import argparse
+
+import uvicorn
+
+from app.config import settings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m app', description='Run the blog server.')
+    parser.add_argument('--host', default=settings.SERVER_HOST)
+    parser.add_argument('--port', type=int, default=settings.SERVER_PORT)
+    parser.add_argument('--workers', type=int, default=settings.SERVER_WORKERS)
+    args = parser.parse_args()
+
+    # Each worker is a separate process with its own pool and in-memory caches; they stay in sync
+    # through the cache invalidation log (app/cache/invalidation.py)
+    uvicorn.run(
+        'app.main:app',
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.SERVER_FORWARDED_ALLOW_IPS,
+    )
+
+
+if __name__ == '__main__':
+    main()
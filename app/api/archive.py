@@ -0,0 +1,54 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from loguru import logger
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.api.dao import BlogDAO, BlogChangeDAO
+from app.config import settings
+from app.dao.session_maker import session_manager
+
+
+async def archive_blogs() -> int:
+    """
+    Moves deleted blogs and stale drafts to the archive tables in batches, one transaction
+    per batch, so the write lock is never held for long. Returns the number of blogs moved.
+    """
+    # Timestamps are stored as naive UTC (CURRENT_TIMESTAMP)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    deleted_before = now - timedelta(days=settings.ARCHIVE_DELETED_AFTER_DAYS)
+    drafts_before = now - timedelta(days=settings.ARCHIVE_DRAFTS_AFTER_DAYS)
+
+    total = 0
+    while True:
+        async with session_manager.create_session() as session:
+            async with session_manager.transaction(session):
+                moved = await BlogDAO.archive(
+                    session=session,
+                    deleted_before=deleted_before,
+                    drafts_before=drafts_before,
+                    batch_size=settings.ARCHIVE_BATCH_SIZE,
+                )
+        total += moved
+        if moved < settings.ARCHIVE_BATCH_SIZE:
+            return total
+
+
+async def prune_changes() -> int:
+    """Drops blog change log rows older than CHANGES_RETENTION_DAYS."""
+    before = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=settings.CHANGES_RETENTION_DAYS)
+    async with session_manager.create_session() as session:
+        async with session_manager.transaction(session):
+            return await BlogChangeDAO.prune(session=session, before=before)
+
+
+async def run_archival(interval: float) -> None:
+    while True:
+        try:
+            moved = await archive_blogs()
+            if moved:
+                logger.info(f"Archival finished: {moved} blogs archived")
+            await prune_changes()
+        except SQLAlchemyError as e:
+            logger.warning(f"Archival failed: {e}")
+        await asyncio.sleep(interval)
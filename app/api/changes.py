@@ -0,0 +1,42 @@
+import asyncio
+import time
+
+from app.api.dao import BlogChangeDAO
+from app.api.models import BlogChange
+from app.dao.session_maker import session_manager
+
+# Waiting requests re-read the log at least this often, in case a wake-up was missed
+RECHECK_INTERVAL = 5.0
+
+
+class ChangeFeed:
+    """
+    Long-poll reads of the blog change log. A request with no new changes waits for `notify`,
+    called after every blog write committed by this or (through cache invalidation) another
+    worker, and holds no database connection while it waits.
+    """
+
+    def __init__(self):
+        self._event = asyncio.Event()
+
+    def notify(self) -> None:
+        self._event.set()
+        self._event = asyncio.Event()
+
+    async def changes_since(self, since: int, limit: int, wait: float) -> list[BlogChange]:
+        deadline = time.monotonic() + wait
+        while True:
+            # Taken before reading, so a change committed meanwhile still wakes the wait below
+            event = self._event
+            async with session_manager.create_session(read_only=True) as session:
+                changes = await BlogChangeDAO.fetch_after(session=session, since=since, limit=limit)
+            remaining = deadline - time.monotonic()
+            if changes or remaining <= 0:
+                return changes
+            try:
+                await asyncio.wait_for(event.wait(), timeout=min(remaining, RECHECK_INTERVAL))
+            except TimeoutError:
+                pass
+
+
+change_feed = ChangeFeed()
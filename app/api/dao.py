@@ -1,13 +1,25 @@
+from datetime import datetime, timedelta
+from typing import Any, Mapping
+
 from loguru import logger
-from sqlalchemy import select, func
+from sqlalchemy import select, func, bindparam, update, case, delete, insert, or_, and_
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
 from sqlalchemy.orm import joinedload, selectinload
 
-from app.api.models import Tag, Blog, BlogTag
-from app.api.schemas import BlogFullResponse, Author
+from app.api.models import Tag, Blog, BlogTag, TrendingBlog, BlogArchive, BlogTagArchive, BlogChange, ScheduledJob
+from app.api.schemas import BlogFullResponse, Author, BlogCreateSchemaAdd
 from app.api.utils import convert_blog_model
+from app.cache.singleflight import coalesce_reads
 from app.dao.base import BaseDAO
+from app.dao.session_maker import before_commit
+
+# Every id takes three bound parameters in the view-count UPDATE, plus one for the CASE default;
+# 332 ids (997 parameters) stay within the 999 of SQLite before 3.32
+VIEW_COUNT_BATCH_SIZE = 332
+# PostgreSQL advisory lock key serializing blog change log writers
+BLOG_CHANGES_LOCK = 0x6368616E6765
 
 
 class TagDAO(BaseDAO):
@@ -44,48 +56,187 @@ class BlogDAO(BaseDAO):
     model = Blog
 
     @classmethod
-    async def get_full_blog_info(cls, session: AsyncSession, blog_id: int):
-        query = (
-            select(cls.model)
-            .options(
-                joinedload(Blog.user),
-                selectinload(Blog.tags),
-            )
-            .filter_by(id=blog_id)
-        )
+    def visible(cls):
+        # Soft-deleted blogs stay in the table until archived, but no read returns them
+        return (cls.model.deleted_at.is_(None),)
 
-        result = await session.execute(query)
-        return result.scalar_one_or_none()
+    @classmethod
+    def _full_blog_info_statement(cls):
+        return cls.cached_statement(
+            'full_blog_info',
+            lambda: (
+                select(cls.model)
+                .options(
+                    joinedload(Blog.user),
+                    selectinload(Blog.tags),
+                )
+                .where(Blog.id == bindparam('blog_id'), *cls.visible())
+            ),
+        )
 
     @classmethod
-    async def delete_blog(cls, session: AsyncSession, blog_id: int, author_id: int) -> dict:
-        query = select(cls.model).filter_by(id=blog_id)
-        result = await session.execute(query)
+    @coalesce_reads
+    async def get_full_blog_info(cls, session: AsyncSession, blog_id: int) -> BlogFullResponse | None:
+        query = cls._full_blog_info_statement()
+        result = await session.execute(query, {'blog_id': blog_id})
         blog = result.scalar_one_or_none()
+        return convert_blog_model(blog) if blog else None
+
+    @classmethod
+    async def _explain_refused_write(
+            cls,
+            session: AsyncSession,
+            blog_id: int,
+            author_id: int,
+            expected_version: int | None,
+            action: str,
+    ) -> tuple[dict | None, Any]:
+        """
+        Called when a conditional write matched no row. Reads only author, status and version
+        to tell a missing blog, another author and a stale version apart.
+        Returns (error result or None, the row).
+        """
+        result = await session.execute(
+            select(cls.model.author, cls.model.status, cls.model.version)
+            .where(cls.model.id == blog_id, *cls.visible())
+        )
+        blog = result.one_or_none()
 
         if not blog:
             return {
                 'message': f'Blog with ID "{blog_id}" is not found',
                 'status': 'error',
-            }
+            }, None
 
         if blog.author != author_id:
             return {
-                'message': f'You don\'t have permissions to delete this blog',
+                'message': f'You don\'t have permissions to {action} this blog',
                 'status': 'error',
-            }
+            }, blog
+
+        if expected_version is not None and blog.version != expected_version:
+            return cls._version_conflict(blog_id, blog.version), blog
+
+        return None, blog
+
+    @classmethod
+    async def add(cls, session: AsyncSession, values: BlogCreateSchemaAdd) -> Blog:
+        blog = await super().add(session=session, values=values)
+        BlogChangeDAO.record(session=session, blog_id=blog.id, operation='created', version=blog.version)
+        return blog
+
+    @classmethod
+    async def delete_blog(
+            cls,
+            session: AsyncSession,
+            blog_id: int,
+            author_id: int,
+            expected_version: int | None = None,
+    ) -> dict:
+        """
+        Soft delete: one conditional UPDATE ... SET deleted_at RETURNING id. The row and its tags
+        are moved to the archive tables later by `archive`. Only when it matches no row a light SELECT tells why.
+        """
+        query = (
+            update(cls.model)
+            .where(cls.model.id == blog_id, cls.model.author == author_id, *cls.visible())
+            .values(deleted_at=func.now(), version=cls.model.version + 1)
+            .returning(cls.model.version)
+            .execution_options(synchronize_session=False)
+        )
+        if expected_version is not None:
+            query = query.where(cls.model.version == expected_version)
+        new_version = await session.scalar(query)
 
-        await session.delete(blog)
-        await session.flush()
+        if new_version is None:
+            refusal, _ = await cls._explain_refused_write(session, blog_id, author_id, expected_version, 'delete')
+            return refusal or cls._version_conflict(blog_id)
+
+        BlogChangeDAO.record(session=session, blog_id=blog_id, operation='deleted', version=new_version)
 
         return {
             'message': f"Blog with ID {blog_id} successfully deleted.",
             'status': 'success'
         }
 
+    @staticmethod
+    def _version_conflict(blog_id: int, current_version: int | None = None) -> dict:
+        return {
+            'message': f'Blog with ID "{blog_id}" was modified by another request',
+            'status': 'conflict',
+            'blog_id': blog_id,
+            'current_version': current_version,
+        }
+
+    @classmethod
+    async def change_blog_status(
+            cls,
+            session: AsyncSession,
+            blog_id: int,
+            new_status: str,
+            author_id: int,
+            expected_version: int | None = None,
+    ) -> dict:
+        """
+        One conditional UPDATE ... RETURNING version does the change; only when it matches no row
+        a light SELECT (no post body) tells why.
+        """
+        query = (
+            update(cls.model)
+            .where(cls.model.id == blog_id, cls.model.author == author_id, cls.model.status != new_status, *cls.visible())
+            .values(status=new_status, version=cls.model.version + 1)
+            .returning(cls.model.version)
+            .execution_options(synchronize_session=False)
+        )
+        if expected_version is not None:
+            query = query.where(cls.model.version == expected_version)
+        new_version = await session.scalar(query)
+
+        if new_version is not None:
+            BlogChangeDAO.record(
+                session=session, blog_id=blog_id, operation='updated', version=new_version, fields=['status'],
+            )
+            return {
+                'message': f"Status changed to '{new_status}'.",
+                'status': 'success',
+                'blog_id': blog_id,
+                'new_status': new_status,
+                'version': new_version,
+            }
+
+        refusal, blog = await cls._explain_refused_write(
+            session, blog_id, author_id, expected_version, 'change status of'
+        )
+        if refusal:
+            return refusal
+        if blog.status != new_status:
+            # Changed between the UPDATE and the SELECT
+            return cls._version_conflict(blog_id, blog.version)
+
+        return {
+            'message': f"Blog already has status '{new_status}'.",
+            'status': 'info',
+            'blog_id': blog_id,
+            'current_status': new_status,
+            'version': blog.version,
+        }
+
     @classmethod
-    async def change_blog_status(cls, session: AsyncSession, blog_id: int, new_status: str, author_id: int) -> dict:
-        query = select(cls.model).filter_by(id=blog_id)
+    async def update_blog(
+            cls,
+            session: AsyncSession,
+            blog_id: int,
+            author_id: int,
+            values: dict,
+            tags: list[str] | None = None,
+            expected_version: int | None = None,
+    ) -> dict:
+        """
+        Writes only the columns whose value differs from the stored one, and applies the difference
+        between the stored and the given tags (when `tags` is not None). Any change, including
+        a tags-only one, bumps updated_at and version; the UPDATE is conditional on the version read.
+        """
+        query = select(cls.model).where(cls.model.id == blog_id, *cls.visible())
         result = await session.execute(query)
         blog = result.scalar_one_or_none()
 
@@ -97,29 +248,81 @@ class BlogDAO(BaseDAO):
 
         if blog.author != author_id:
             return {
-                'message': f'You don\'t have permissions to change status of this blog',
+                'message': f'You don\'t have permissions to edit this blog',
                 'status': 'error',
             }
 
-        if blog.status == new_status:
+        if expected_version is not None and blog.version != expected_version:
+            return cls._version_conflict(blog_id, blog.version)
+
+        changed = {name: value for name, value in values.items() if getattr(blog, name) != value}
+        tags_added, tags_removed = [], []
+        if tags is not None:
+            tags_added, tags_removed = await BlogTagDAO.sync_blog_tags(session=session, blog_id=blog_id, tag_names=tags)
+
+        if not changed and not tags_added and not tags_removed:
             return {
-                'message': f"Blog already has status '{new_status}'.",
+                'message': 'Nothing to update.',
                 'status': 'info',
                 'blog_id': blog_id,
-                'current_status': new_status
+                'version': blog.version,
             }
 
-        blog.status = new_status
-        await session.flush()
+        # Unit-of-work flush, so version_id_col adds "AND version = :read_version" and increments it;
+        # only modified attributes are written
+        for name, value in changed.items():
+            setattr(blog, name, value)
+        if not changed:
+            blog.updated_at = func.now()
+        try:
+            await session.flush()
+        except StaleDataError:
+            return cls._version_conflict(blog_id)
+        logger.info(f"Blog {blog_id} updated: {sorted(changed)}, version {blog.version}")
+        BlogChangeDAO.record(
+            session=session,
+            blog_id=blog_id,
+            operation='updated',
+            version=blog.version,
+            fields=sorted(changed) + (['tags'] if tags_added or tags_removed else []),
+        )
 
         return {
-            'message': f"Status changed to '{new_status}'.",
+            'message': f"Blog with ID {blog_id} successfully updated.",
             'status': 'success',
             'blog_id': blog_id,
-            'new_status': new_status
+            'updated_fields': sorted(changed),
+            'tags_added': tags_added,
+            'tags_removed': tags_removed,
+            'version': blog.version,
         }
 
     @classmethod
+    def _blog_list_statements(cls, by_author: bool, by_tag: bool):
+        # Count and page statements for one list variant, built once; filters, offset and limit are bound parameters
+        def build():
+            base_query = select(cls.model).where(*cls.visible()).filter_by(status='published')
+            if by_author:
+                base_query = base_query.where(cls.model.author == bindparam('author_id'))
+            if by_tag:
+                base_query = base_query.where(cls.model.tags.any(Tag.name.ilike(bindparam('tag_pattern'))))
+
+            count_query = select(func.count()).select_from(base_query.subquery())
+            paginated_query = (
+                base_query
+                .options(
+                    joinedload(cls.model.user),
+                    selectinload(cls.model.tags)
+                )
+                .offset(bindparam('offset'))
+                .limit(bindparam('limit'))
+            )
+            return count_query, paginated_query
+
+        return cls.cached_statement(('blog_list', by_author, by_tag), build)
+
+    @classmethod
+    @coalesce_reads
     async def get_blog_list(
             cls,
             session: AsyncSession,
@@ -131,19 +334,17 @@ class BlogDAO(BaseDAO):
         page_size = max(3, min(page_size, 100))
         page = max(1, page)
 
-        base_query = select(cls.model).options(
-            joinedload(cls.model.user),
-            selectinload(cls.model.tags)
-        ).filter_by(status='published')
-
+        count_query, paginated_query = cls._blog_list_statements(
+            by_author=author_id is not None,
+            by_tag=tag is not None,
+        )
+        params = {}
         if author_id is not None:
-            base_query = base_query.filter_by(author=author_id)
-
+            params['author_id'] = author_id
         if tag is not None:
-            base_query = base_query.join(cls.model.tags).filter(cls.model.tags.any(Tag.name.ilike(f"%{tag.lower()}%")))
+            params['tag_pattern'] = f"%{tag.lower()}%"
 
-        count_query = select(func.count()).select_from(base_query.subquery())
-        total_result = await session.scalar(count_query)
+        total_result = await session.scalar(count_query, params)
 
         if not total_result:
             return {
@@ -156,9 +357,7 @@ class BlogDAO(BaseDAO):
         total_page = (total_result + page_size - 1) // page_size
 
         offset = (page - 1) * page_size
-        paginated_query = base_query.offset(offset).limit(page_size)
-
-        result = await session.execute(paginated_query)
+        result = await session.execute(paginated_query, {**params, 'offset': offset, 'limit': page_size})
         blogs = result.scalars().all()
 
         unique_blogs = []
@@ -186,6 +385,103 @@ class BlogDAO(BaseDAO):
             "blogs": unique_blogs
         }
 
+    @classmethod
+    async def increment_views(cls, session: AsyncSession, counts: Mapping[int, int]) -> int:
+        """
+        Adds buffered view counts in one `UPDATE ... SET views = views + CASE id WHEN ... END`
+        per batch of ids. Returns the number of updated blogs.
+        """
+        blog_ids = list(counts)
+        updated = 0
+        try:
+            for start in range(0, len(blog_ids), VIEW_COUNT_BATCH_SIZE):
+                batch = {blog_id: counts[blog_id] for blog_id in blog_ids[start:start + VIEW_COUNT_BATCH_SIZE]}
+                stmt = (
+                    update(cls.model)
+                    .where(cls.model.id.in_(list(batch)), *cls.visible())
+                    .values(
+                        views=cls.model.views + case(batch, value=cls.model.id, else_=0),
+                        # A view is not an edit, keep updated_at as is
+                        updated_at=cls.model.updated_at,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                result = await session.execute(stmt)
+                updated += result.rowcount
+            logger.info(f"Views of {updated} blogs updated ({sum(counts.values())} views)")
+            return updated
+        except SQLAlchemyError as e:
+            logger.error(f"Error while updating blog views: {e}")
+            raise
+
+    @classmethod
+    async def archive(
+            cls,
+            session: AsyncSession,
+            deleted_before: datetime,
+            drafts_before: datetime,
+            batch_size: int,
+    ) -> int:
+        """
+        Moves one batch of blogs deleted before `deleted_before` and drafts not updated since
+        `drafts_before`, with their tag pairs, to blogs_archive and blogtags_archive
+        (two INSERT ... SELECT and one DELETE). Returns the number of blogs moved.
+        """
+        archivable = or_(
+            cls.model.deleted_at < deleted_before,
+            and_(cls.model.status == 'draft', cls.model.updated_at < drafts_before),
+        )
+        # Locks the batch on PostgreSQL, so concurrent archivers take different rows; SQLite ignores it
+        result = await session.scalars(
+            select(cls.model.id).where(archivable).order_by(cls.model.id).limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        blog_ids = list(result.all())
+        if not blog_ids:
+            return 0
+
+        # The condition is repeated, in case a blog changed after it was selected
+        batch = and_(cls.model.id.in_(blog_ids), archivable)
+        blog_columns = [column.name for column in BlogArchive.__table__.columns]
+        # Archived tag pairs get ids of their own: SQLite reuses the ids of deleted blogtags rows
+        blog_tag_columns = [column.name for column in BlogTagArchive.__table__.columns if column.name != 'id']
+        try:
+            await session.execute(
+                insert(BlogArchive).from_select(
+                    blog_columns, select(*[cls.model.__table__.c[name] for name in blog_columns]).where(batch)
+                )
+            )
+            await session.execute(
+                insert(BlogTagArchive).from_select(
+                    blog_tag_columns,
+                    select(*[BlogTag.__table__.c[name] for name in blog_tag_columns])
+                    .where(BlogTag.blog_id.in_(select(cls.model.id).where(batch))),
+                )
+            )
+            # blogtags and trendingblogs rows are removed by ON DELETE CASCADE
+            result = await session.execute(
+                delete(cls.model).where(batch).execution_options(synchronize_session=False)
+            )
+            logger.info(f"{result.rowcount} blogs moved to the archive")
+            return result.rowcount
+        except SQLAlchemyError as e:
+            logger.error(f"Error while archiving blogs: {e}")
+            raise
+
+    @classmethod
+    async def get_most_viewed(cls, session: AsyncSession, limit: int = 10) -> list[Blog]:
+        query = cls.cached_statement(
+            'most_viewed',
+            lambda: (
+                select(cls.model)
+                .where(cls.model.status == 'published', cls.model.views > 0, *cls.visible())
+                .order_by(cls.model.views.desc(), cls.model.id.desc())
+                .limit(bindparam('limit'))
+            ),
+        )
+        result = await session.execute(query, {'limit': limit})
+        return list(result.scalars().all())
+
 
 class BlogTagDAO(BaseDAO):
     model = BlogTag
@@ -213,3 +509,183 @@ class BlogTagDAO(BaseDAO):
                 raise e
         else:
             logger.warning('No data for adding to blogtags table')
+
+    @classmethod
+    async def sync_blog_tags(cls, session: AsyncSession, blog_id: int, tag_names: list[str]) -> tuple[list[str], list[str]]:
+        """
+        Makes the tags of a blog equal to `tag_names` with at most one DELETE and one multi-row INSERT
+        on blogtags; unchanged pairs are left alone. Returns (added, removed) tag names.
+        """
+        wanted = {tag_name.lower() for tag_name in tag_names}
+        result = await session.execute(
+            select(Tag.id, Tag.name).join(cls.model, cls.model.tag_id == Tag.id).where(cls.model.blog_id == blog_id)
+        )
+        current = {name: tag_id for tag_id, name in result.all()}
+        added = sorted(wanted - current.keys())
+        removed = sorted(current.keys() - wanted)
+
+        try:
+            if removed:
+                await session.execute(
+                    delete(cls.model)
+                    .where(cls.model.blog_id == blog_id, cls.model.tag_id.in_([current[name] for name in removed]))
+                    .execution_options(synchronize_session=False)
+                )
+            if added:
+                tag_ids = await TagDAO.add_tags(session=session, tag_names=added)
+                await session.execute(
+                    insert(cls.model).values([{'blog_id': blog_id, 'tag_id': tag_id} for tag_id in tag_ids])
+                )
+            logger.info(f"Tags of blog {blog_id} synced: +{added} -{removed}")
+            return added, removed
+        except SQLAlchemyError as e:
+            logger.error(f"Error while syncing tags of blog {blog_id}: {e}")
+            raise
+
+    @classmethod
+    async def get_published_blog_tags(cls, session: AsyncSession, blog_id: int | None = None) -> list:
+        """(blog_id, title, tag_id) rows of published blogs, of one blog when `blog_id` is given."""
+        query = (
+            select(Blog.id, Blog.title, cls.model.tag_id)
+            .join(cls.model, cls.model.blog_id == Blog.id)
+            .where(Blog.status == 'published', *BlogDAO.visible())
+        )
+        if blog_id is not None:
+            query = query.where(Blog.id == blog_id)
+        result = await session.execute(query)
+        return list(result.all())
+
+
+class TrendingDAO(BaseDAO):
+    model = TrendingBlog
+
+    @classmethod
+    async def get_candidates(cls, session: AsyncSession, since: datetime) -> tuple[list, list]:
+        """
+        Published posts created since `since` as (id, title, short_description, views, created_at) rows,
+        and their (blog_id, tag name) pairs. Post contents are not loaded.
+        """
+        recent = (Blog.status == 'published', Blog.created_at >= since, *BlogDAO.visible())
+        posts = await session.execute(
+            select(Blog.id, Blog.title, Blog.short_description, Blog.views, Blog.created_at).where(*recent)
+        )
+        tags = await session.execute(
+            select(BlogTag.blog_id, Tag.name)
+            .join(Tag, Tag.id == BlogTag.tag_id)
+            .join(Blog, Blog.id == BlogTag.blog_id)
+            .where(*recent)
+        )
+        return list(posts.all()), list(tags.all())
+
+    @classmethod
+    async def replace_snapshot(cls, session: AsyncSession, entries: list[dict]) -> None:
+        try:
+            await session.execute(delete(cls.model))
+            if entries:
+                await session.execute(insert(cls.model), entries)
+            logger.info(f"Trending snapshot saved: {len(entries)} blogs")
+        except SQLAlchemyError as e:
+            logger.error(f"Error while saving trending snapshot: {e}")
+            raise
+
+    @classmethod
+    async def get_snapshot(cls, session: AsyncSession) -> list:
+        """Persisted ranking as (id, title, short_description, views, score) rows, best first."""
+        result = await session.execute(
+            select(Blog.id, Blog.title, Blog.short_description, Blog.views, cls.model.score)
+            .join(Blog, Blog.id == cls.model.blog_id)
+            .where(Blog.status == 'published', *BlogDAO.visible())
+            .order_by(cls.model.rank)
+        )
+        return list(result.all())
+
+
+class ScheduledJobDAO(BaseDAO):
+    model = ScheduledJob
+
+    @classmethod
+    async def claim(cls, session: AsyncSession, name: str, now: datetime, interval: timedelta) -> bool:
+        """
+        Claims the run of job `name` due at `now`: true unless it ran less than `interval` ago.
+        The claim is one conditional UPDATE, so of concurrent claimers exactly one wins; the row stays
+        locked (on SQLite, the database) until the transaction ends. Times are naive UTC from the caller,
+        never the database clock.
+        """
+        await cls.add_if_missing(
+            session=session, unique_fields=['name'], values={'name': name, 'last_run_at': datetime(1970, 1, 1)},
+        )
+        claimed = await session.scalar(
+            update(cls.model)
+            .where(cls.model.name == name, cls.model.last_run_at <= now - interval)
+            .values(last_run_at=now)
+            .returning(cls.model.id)
+            .execution_options(synchronize_session=False)
+        )
+        return claimed is not None
+
+
+class BlogChangeDAO(BaseDAO):
+    """
+    Writes go into the caller's transaction, so a change is visible exactly when the blog write is.
+    View counts are not logged.
+
+    Consumers read changes after the last id they saw, so ids must become visible in increasing
+    order. On PostgreSQL a transaction could commit with a lower id after a higher one was read;
+    change log writers therefore take an advisory lock before inserting, and insert as the last
+    statement before commit, so the lock is held only for the insert and the commit. SQLite
+    serializes writers anyway.
+    """
+    model = BlogChange
+
+    @classmethod
+    def record(
+            cls,
+            session: AsyncSession,
+            blog_id: int,
+            operation: str,
+            version: int,
+            fields: list[str] | None = None,
+    ) -> None:
+        """Queues a change; it is inserted when the session manager commits the transaction."""
+        values = {
+            'blog_id': blog_id,
+            'operation': operation,
+            'version': version,
+            'fields': ','.join(fields) if fields else None,
+        }
+        before_commit(session, lambda: cls._insert(session, values))
+
+    @classmethod
+    async def _insert(cls, session: AsyncSession, values: dict) -> None:
+        if session.bind.dialect.name == 'postgresql':
+            await session.execute(select(func.pg_advisory_xact_lock(BLOG_CHANGES_LOCK)))
+        await session.execute(insert(cls.model).values(**values))
+
+    @classmethod
+    async def fetch_after(cls, session: AsyncSession, since: int, limit: int) -> list[BlogChange]:
+        query = cls.cached_statement(
+            'changes_after',
+            lambda: (
+                select(cls.model)
+                .where(cls.model.id > bindparam('since'))
+                .order_by(cls.model.id)
+                .limit(bindparam('limit'))
+            ),
+        )
+        result = await session.execute(query, {'since': since, 'limit': limit})
+        return list(result.scalars().all())
+
+    @classmethod
+    async def prune(cls, session: AsyncSession, before: datetime) -> int:
+        try:
+            result = await session.execute(
+                delete(cls.model)
+                # The newest row stays so `since` cursors held by consumers stay valid
+                .where(cls.model.created_at < before, cls.model.id < select(func.max(cls.model.id)).scalar_subquery())
+                .execution_options(synchronize_session=False)
+            )
+            logger.info(f"Blog change log pruned: {result.rowcount} rows")
+            return result.rowcount
+        except SQLAlchemyError as e:
+            logger.error(f"Error while pruning blog change log: {e}")
+            raise
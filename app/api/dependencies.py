@@ -1,13 +1,13 @@
-from fastapi import Depends
+from fastapi import Depends, Header
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dao import BlogDAO
-from app.api.models import Blog
-from app.api.schemas import BlogNotFound, BlogFullResponse, Author
-from app.api.utils import convert_blog_model
+from app.api.schemas import BlogNotFound, BlogFullResponse
+from app.api.utils import parse_if_match, is_weak_etag
 from app.auth.dependencies import get_current_user_optional
 from app.auth.models import User
 from app.dao.session_maker import SessionDep
+from app.exceptions import InvalidIfMatchException, BlogVersionMismatchException
 
 
 async def get_blog_info(
@@ -21,9 +21,18 @@ async def get_blog_info(
         return BlogNotFound(
             message=f'Blog with ID "{blog_id}" does not exist or you have no enough permissions',
         )
-    if isinstance(result, Blog):
-        if result.status == 'draft' and (author_id != result.author):
-            return BlogNotFound(
-                message='This blog is in draft status, only author has access to it',
-            )
-        return convert_blog_model(result)
+    if result.status == 'draft' and (author_id != result.author.author_id):
+        return BlogNotFound(
+            message='This blog is in draft status, only author has access to it',
+        )
+    return result
+
+
+def get_expected_version(if_match: str | None = Header(None)) -> int | None:
+    # If-Match uses the strong comparison, a weak entity tag never matches (RFC 9110, 13.1.1)
+    if is_weak_etag(if_match):
+        raise BlogVersionMismatchException
+    try:
+        return parse_if_match(if_match)
+    except ValueError:
+        raise InvalidIfMatchException
@@ -1,21 +1,40 @@
-from sqlalchemy import ForeignKey, Text, String, UniqueConstraint
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, Text, String, UniqueConstraint, TIMESTAMP, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.dao.database import Base, str_uniq
+from app.dao.database import Base
 
 
 class Blog(Base):
-    title: Mapped[str_uniq]
+    # Unique among live blogs only (uq_blogs_title), a deleted blog frees its title
+    title: Mapped[str] = mapped_column(nullable=False)
     author: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     content: Mapped[str] = mapped_column(Text)
     short_description: Mapped[str] = mapped_column(Text)
     status: Mapped[str] = mapped_column(default="published", server_default="published")
+    views: Mapped[int] = mapped_column(default=0, server_default="0", index=True)
+    # Incremented by every flush that changes the row; flushes of a stale copy fail with StaleDataError
+    version: Mapped[int] = mapped_column(nullable=False, default=1, server_default="1")
+    # Set by deletion; the row is moved to blogs_archive by the archival job later
+    deleted_at: Mapped[datetime | None] = mapped_column(TIMESTAMP, nullable=True, index=True)
     user: Mapped["User"] = relationship("User", back_populates="blogs")
     tags: Mapped[list["Tag"]] = relationship(
         secondary="blogtags",
         back_populates="blogs",
     )
 
+    __mapper_args__ = {"version_id_col": version}
+    __table_args__ = (
+        Index(
+            'uq_blogs_title', 'title', unique=True,
+            sqlite_where=text('deleted_at IS NULL'),
+            postgresql_where=text('deleted_at IS NULL'),
+        ),
+        # Archived blogs keep their ids, so SQLite must never hand out the id of a deleted row again
+        {'sqlite_autoincrement': True},
+    )
+
 
 class Tag(Base):
     name: Mapped[str] = mapped_column(String(50), unique=True)
@@ -33,3 +52,54 @@ class BlogTag(Base):
         UniqueConstraint("blog_id", 'tag_id', name='uq_blog_tag'),
     )
 
+
+class TrendingBlog(Base):
+    """Latest persisted trending ranking, replaced as a whole on every refresh."""
+    blog_id: Mapped[int] = mapped_column(ForeignKey("blogs.id", ondelete="CASCADE"), unique=True, nullable=False)
+    rank: Mapped[int] = mapped_column(nullable=False)
+    score: Mapped[float] = mapped_column(nullable=False)
+
+
+class ScheduledJob(Base):
+    """Last run of a periodic job shared by all workers, so only one of them runs it per interval."""
+    name: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
+    last_run_at: Mapped[datetime] = mapped_column(TIMESTAMP, nullable=False)
+
+
+class BlogArchive(Base):
+    """Archived blogs: the columns of `blogs`, rows keep their ids. Written only by the archival job."""
+    __tablename__ = 'blogs_archive'
+
+    title: Mapped[str] = mapped_column(nullable=False)
+    author: Mapped[int] = mapped_column(nullable=False, index=True)
+    content: Mapped[str] = mapped_column(Text)
+    short_description: Mapped[str] = mapped_column(Text)
+    status: Mapped[str] = mapped_column(server_default="published")
+    views: Mapped[int] = mapped_column(server_default="0")
+    version: Mapped[int] = mapped_column(server_default="1")
+    deleted_at: Mapped[datetime | None] = mapped_column(TIMESTAMP, nullable=True)
+
+
+class BlogTagArchive(Base):
+    __tablename__ = 'blogtags_archive'
+
+    blog_id: Mapped[int] = mapped_column(nullable=False, index=True)
+    tag_id: Mapped[int] = mapped_column(nullable=False)
+
+
+class BlogChange(Base):
+    """
+    Change log of blogs, one row per committed write, in the write's own transaction.
+    `id` is the sequence number consumers sync from; no FK, rows outlive archived blogs.
+    """
+    __tablename__ = 'blog_changes'
+
+    blog_id: Mapped[int] = mapped_column(nullable=False, index=True)
+    # 'created', 'updated' or 'deleted'
+    operation: Mapped[str] = mapped_column(String(20), nullable=False)
+    version: Mapped[int] = mapped_column(nullable=False)
+    # Comma-separated names of the changed fields ('tags' for tag changes) of an update
+    fields: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # Consumers sync from the last id they saw: SQLite must not restart ids after a prune
+    __table_args__ = {'sqlite_autoincrement': True}
@@ -0,0 +1,141 @@
+import asyncio
+import heapq
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+from typing import Iterable
+
+from loguru import logger
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.api.dao import BlogTagDAO
+from app.config import settings
+from app.dao.session_maker import session_manager
+
+
+class RelatedPostsIndex:
+    """
+    In-memory inverted index tag id -> sorted array of published blog ids. Related posts of a blog
+    are ranked by Jaccard similarity of tag sets, computed on first request and memoized. When tags
+    of a blog change only the memoized results of blogs sharing a tag with it are dropped.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.postings: dict[int, array] = {}
+        self.blog_tags: dict[int, array] = {}
+        self.titles: dict[int, str] = {}
+        self._related: dict[int, tuple[int, ...]] = {}
+        self._reloads: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self.blog_tags)
+
+    def related(self, blog_id: int) -> list[dict]:
+        related_ids = self._related.get(blog_id)
+        if related_ids is None:
+            related_ids = self._related[blog_id] = self._compute(blog_id)
+        return [{'id': related_id, 'title': self.titles[related_id]} for related_id in related_ids]
+
+    def _compute(self, blog_id: int) -> tuple[int, ...]:
+        tags = self.blog_tags.get(blog_id)
+        if not tags:
+            return ()
+        shared = Counter()
+        for tag_id in tags:
+            shared.update(self.postings[tag_id])
+        del shared[blog_id]
+
+        def jaccard(other_id: int) -> float:
+            common = shared[other_id]
+            return common / (len(tags) + len(self.blog_tags[other_id]) - common)
+
+        # Ties go to the newer post
+        best = heapq.nlargest(self.limit, shared, key=lambda other_id: (jaccard(other_id), other_id))
+        return tuple(best)
+
+    def set_blog(self, blog_id: int, title: str, tag_ids: Iterable[int]) -> None:
+        """Adds a published blog or replaces its tags."""
+        old_tags = set(self.blog_tags.get(blog_id, ()))
+        new_tags = set(tag_ids)
+        self._drop_related(old_tags | new_tags, blog_id)
+
+        for tag_id in old_tags - new_tags:
+            self._remove_posting(tag_id, blog_id)
+        for tag_id in new_tags - old_tags:
+            insort(self.postings.setdefault(tag_id, array('q')), blog_id)
+
+        if new_tags:
+            self.blog_tags[blog_id] = array('q', sorted(new_tags))
+            self.titles[blog_id] = title
+        else:
+            self.blog_tags.pop(blog_id, None)
+            self.titles.pop(blog_id, None)
+
+    def remove_blog(self, blog_id: int) -> None:
+        """Removes a deleted or unpublished blog."""
+        self.set_blog(blog_id, '', ())
+
+    def _remove_posting(self, tag_id: int, blog_id: int) -> None:
+        posting = self.postings[tag_id]
+        position = bisect_left(posting, blog_id)
+        if position < len(posting) and posting[position] == blog_id:
+            posting.pop(position)
+        if not posting:
+            del self.postings[tag_id]
+
+    def _drop_related(self, tag_ids: set[int], blog_id: int) -> None:
+        self._related.pop(blog_id, None)
+        for tag_id in tag_ids:
+            for other_id in self.postings.get(tag_id, ()):
+                self._related.pop(other_id, None)
+
+    async def rebuild(self) -> None:
+        async with session_manager.create_session(read_only=True) as session:
+            rows = await BlogTagDAO.get_published_blog_tags(session=session)
+
+        postings = defaultdict(list)
+        blog_tags = defaultdict(list)
+        titles = {}
+        for blog_id, title, tag_id in rows:
+            postings[tag_id].append(blog_id)
+            blog_tags[blog_id].append(tag_id)
+            titles[blog_id] = title
+
+        self.postings = {tag_id: array('q', sorted(set(ids))) for tag_id, ids in postings.items()}
+        self.blog_tags = {blog_id: array('q', sorted(set(ids))) for blog_id, ids in blog_tags.items()}
+        self.titles = titles
+        self._related = {}
+        logger.info(f"Related posts index built: {len(self.blog_tags)} blogs, {len(self.postings)} tags")
+
+    async def reload_blog(self, blog_id: int) -> None:
+        async with session_manager.create_session(read_only=True) as session:
+            rows = await BlogTagDAO.get_published_blog_tags(session=session, blog_id=blog_id)
+        if rows:
+            self.set_blog(blog_id, rows[0].title, (row.tag_id for row in rows))
+        else:
+            self.remove_blog(blog_id)
+
+    def schedule_reload(self, blog_id: int) -> None:
+        """Reloads a blog in the background; for after-commit callbacks, which can't await."""
+        async def reload() -> None:
+            try:
+                await self.reload_blog(blog_id)
+            except SQLAlchemyError as e:
+                logger.warning(f"Related posts of blog {blog_id} not reloaded: {e}")
+
+        task = asyncio.create_task(reload())
+        self._reloads.add(task)
+        task.add_done_callback(self._reloads.discard)
+
+    async def run(self, interval: float) -> None:
+        # Periodic rebuilds pick up changes made by other worker processes
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.rebuild()
+            except SQLAlchemyError as e:
+                logger.warning(f"Related posts index rebuild failed: {e}")
+
+
+related_posts = RelatedPostsIndex(limit=settings.RELATED_POSTS_LIMIT)
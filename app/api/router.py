@@ -1,17 +1,26 @@
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
 from loguru import logger
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.responses import JSONResponse
 
+from app.api.changes import change_feed
 from app.api.dao import BlogDAO, TagDAO, BlogTagDAO
-from app.api.dependencies import get_blog_info
-from app.api.schemas import BlogCreateSchemaBase, BlogCreateSchemaAdd, BlogNotFound, BlogFullResponse
-from app.auth.dependencies import get_current_user
+from app.api.dependencies import get_blog_info, get_expected_version
+from app.api.schemas import BlogCreateSchemaBase, BlogCreateSchemaAdd, BlogNotFound, BlogFullResponse, BlogViewCount, \
+    BlogTrending, BlogUpdateSchema, BlogChangeResponse, BlogChangesResponse
+from app.api.trending import trending
+from app.api.utils import blog_etag
+from app.auth.dependencies import get_current_user, get_current_admin_user
 from app.auth.models import User
+from app.cache.invalidation import invalidation, BLOG_CHANGED, BLOG_REMOVED
+from app.cache.singleflight import flights
+from app.config import settings
+from app.dao.errors import is_unique_violation
 from app.dao.session_maker import TransactionSessionDep, SessionDep
+from app.exceptions import BlogVersionMismatchException
 
 router = APIRouter(prefix='/api', tags=['API'])
 
@@ -38,43 +47,124 @@ async def add_blog(
                     {'blog_id': blog_id, 'tag_id': tag_id} for tag_id in tags_ids
                 ]
             )
+        invalidation.publish(session, BLOG_CHANGED, blog_id)
         return {'status': 'success', 'message': f'Blog with id {blog_id} successfully added.'}
     except IntegrityError as e:
-        if 'UNIQUE constraint failed' in str(e.orig):
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUESTS, detail='Blog with this name already exists')
+        if is_unique_violation(e):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Blog with this name already exists')
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail='Error while blog adding')
 
 
+# Declared before /blogs/{blog_id}, which would otherwise capture the paths
+@router.get('/blogs/trending', summary='Trending published blogs')
+async def get_trending_blogs(
+        limit: int = Query(10, ge=1, le=settings.TRENDING_SIZE, description="Number of blogs"),
+) -> list[BlogTrending]:
+    return [BlogTrending.model_validate(post) for post in trending.top(limit)]
+
+
+@router.get('/blogs/most_viewed', summary='Most viewed published blogs')
+async def get_most_viewed_blogs(
+        limit: int = Query(10, ge=1, le=100, description="Number of blogs"),
+        session: AsyncSession = SessionDep,
+) -> list[BlogViewCount]:
+    blogs = await BlogDAO.get_most_viewed(session=session, limit=limit)
+    return [BlogViewCount.model_validate(blog) for blog in blogs]
+
+
 @router.get('/blogs/{blog_id}', summary='Get blog info')
 async def get_blog_endpoint(
         blog_id: int,
+        response: Response,
         blog_info: BlogFullResponse | BlogNotFound = Depends(get_blog_info),
 ) -> BlogFullResponse | BlogNotFound:
+    if isinstance(blog_info, BlogFullResponse):
+        response.headers['ETag'] = blog_etag(blog_info.version)
     return blog_info
 
 
+def check_write_result(result: dict, response: Response) -> None:
+    # Maps the DAO result of a blog write to an HTTP error, sets the ETag of the new version
+    if result['status'] == 'error':
+        raise HTTPException(status_code=400, detail=result['message'])
+    if result['status'] == 'conflict':
+        raise BlogVersionMismatchException
+    if result.get('version') is not None:
+        response.headers['ETag'] = blog_etag(result['version'])
+
+
 @router.delete('/blogs/{blog_id}', summary="Delete blog")
 async def delete_blog(
         blog_id: int,
+        response: Response,
+        expected_version: int | None = Depends(get_expected_version),
         session: AsyncSession = TransactionSessionDep,
         current_user: User = Depends(get_current_user)
 ):
-    result = await BlogDAO.delete_blog(session, blog_id, current_user.id)
-    if result['status'] == 'error':
-        raise HTTPException(status_code=400, detail=result['message'])
+    result = await BlogDAO.delete_blog(session, blog_id, current_user.id, expected_version)
+    check_write_result(result, response)
+    invalidation.publish(session, BLOG_REMOVED, blog_id)
+    return result
+
+
+async def apply_blog_update(
+        session: AsyncSession,
+        response: Response,
+        blog_id: int,
+        user: User,
+        update_data: dict,
+        expected_version: int | None,
+) -> dict:
+    values = dict(update_data)
+    tags = values.pop('tags', None)
+    try:
+        result = await BlogDAO.update_blog(session, blog_id, user.id, values, tags, expected_version)
+    except IntegrityError as e:
+        if is_unique_violation(e):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Blog with this name already exists')
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail='Error while blog updating')
+    check_write_result(result, response)
+    if result['status'] == 'success':
+        topic = BLOG_CHANGED if values.get('status', 'published') == 'published' else BLOG_REMOVED
+        invalidation.publish(session, topic, blog_id)
     return result
 
 
-@router.patch('/blogs/{blog_id}', summary="Change blog status")
+@router.put('/blogs/{blog_id}', summary="Replace blog content and tags")
+async def replace_blog(
+        blog_id: int,
+        blog_data: BlogCreateSchemaBase,
+        response: Response,
+        expected_version: int | None = Depends(get_expected_version),
+        session: AsyncSession = TransactionSessionDep,
+        current_user: User = Depends(get_current_user)
+):
+    return await apply_blog_update(session, response, blog_id, current_user, blog_data.model_dump(), expected_version)
+
+
+@router.patch('/blogs/{blog_id}', summary="Update blog fields or change blog status")
 async def change_blog_status(
         blog_id: int,
-        new_status: str,
+        response: Response,
+        new_status: str | None = None,
+        update_data: BlogUpdateSchema | None = None,
+        expected_version: int | None = Depends(get_expected_version),
         session: AsyncSession = TransactionSessionDep,
         current_user: User = Depends(get_current_user)
 ):
-    result = await BlogDAO.change_blog_status(session, blog_id, new_status, current_user.id)
-    if result['status'] == 'error':
-        raise HTTPException(status_code=400, detail=result['message'])
+    # A JSON body updates only the fields it contains; `?new_status=` alone is the original status change
+    if update_data is not None:
+        values = update_data.model_dump(exclude_unset=True)
+        if new_status is not None:
+            values.setdefault('status', new_status)
+        return await apply_blog_update(session, response, blog_id, current_user, values, expected_version)
+    if new_status is None:
+        raise HTTPException(status_code=400, detail='Nothing to update')
+
+    result = await BlogDAO.change_blog_status(session, blog_id, new_status, current_user.id, expected_version)
+    check_write_result(result, response)
+    if result['status'] == 'success':
+        invalidation.publish(session, BLOG_CHANGED if new_status == 'published' else BLOG_REMOVED, blog_id)
     return result
 
 
@@ -98,3 +188,37 @@ async def get_blogs_info(
     except Exception as e:
         logger.error(f'Error while blogs fetching: {e}')
         return JSONResponse(status_code=500, content={'detail': 'Server error'})
+
+
+@router.get('/metrics/coalescing', summary='Single-flight coalescing stats')
+async def get_coalescing_metrics(user_data: User = Depends(get_current_admin_user)) -> dict:
+    return {name: flight.stats() for name, flight in flights.items()}
+
+
+@router.get('/changes', summary='Blog changes after a sequence number (long poll)')
+async def get_changes(
+        since: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=1000),
+        wait: float = Query(0, ge=0, le=settings.CHANGES_MAX_WAIT),
+        session: AsyncSession = SessionDep,
+        user_data: User = Depends(get_current_admin_user),
+) -> BlogChangesResponse:
+    # The request session was only needed to authenticate; the feed opens short sessions of its own,
+    # so no pooled connection is held while the request waits
+    await session.close()
+    # With `wait`, an empty answer is delayed until a change arrives or `wait` seconds pass
+    changes = await change_feed.changes_since(since, limit, wait)
+    return BlogChangesResponse(
+        changes=[
+            BlogChangeResponse(
+                seq=change.id,
+                blog_id=change.blog_id,
+                operation=change.operation,
+                version=change.version,
+                fields=change.fields.split(',') if change.fields else [],
+                changed_at=change.created_at,
+            )
+            for change in changes
+        ],
+        last_seq=changes[-1].id if changes else since,
+    )
@@ -1,6 +1,6 @@
 import datetime
 
-from pydantic import ConfigDict, BaseModel
+from pydantic import ConfigDict, BaseModel, field_validator
 
 from app.auth.schemas import UserBase
 
@@ -20,6 +20,24 @@ class BlogCreateSchemaAdd(BlogCreateSchemaBase):
     author: int
 
 
+class BlogUpdateValues(BaseModelConfig):
+    title: str | None = None
+    content: str | None = None
+    short_description: str | None = None
+    status: str | None = None
+
+    @field_validator("title", "content", "short_description", "status")
+    def reject_null(cls, value: str | None) -> str:
+        # A field may be left out, but the columns are NOT NULL
+        if value is None:
+            raise ValueError('Field may be omitted, but not null')
+        return value
+
+
+class BlogUpdateSchema(BlogUpdateValues):
+    tags: list[str] | None = None
+
+
 class BlogNotFound(BaseModelConfig):
     message: str
     status: str = 'Error'
@@ -39,6 +57,31 @@ class BlogFullResponse(BaseModelConfig):
     author: Author
     tags: list[str]
     created_at: datetime.datetime
+    views: int = 0
+    version: int = 1
+
+
+class BlogViewCount(BaseModelConfig):
+    id: int
+    title: str
+    short_description: str
+    views: int
+
+
+class BlogTrending(BlogViewCount):
+    score: float
+
 
+class BlogChangeResponse(BaseModelConfig):
+    seq: int
+    blog_id: int
+    operation: str
+    version: int
+    fields: list[str]
+    changed_at: datetime.datetime
 
 
+class BlogChangesResponse(BaseModelConfig):
+    changes: list[BlogChangeResponse]
+    # Pass as `since` in the next request
+    last_seq: int
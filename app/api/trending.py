@@ -0,0 +1,133 @@
+import asyncio
+import heapq
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from loguru import logger
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.api.dao import TrendingDAO, ScheduledJobDAO
+from app.config import settings
+from app.dao.session_maker import session_manager
+
+# How much a post in the most viewed tag is lifted over a post without popular tags
+TAG_BOOST = 0.5
+# scheduledjobs row claimed by the worker that refreshes the ranking
+TRENDING_JOB = 'trending'
+
+
+@dataclass(frozen=True, slots=True)
+class TrendingPost:
+    id: int
+    title: str
+    short_description: str
+    views: int
+    score: float
+
+
+def trending_score(views: int, age_hours: float, tag_popularity: float, gravity: float) -> float:
+    """Views decayed by age (Hacker News style), lifted for posts in popular tags (0 <= tag_popularity <= 1)."""
+    return (views + 1) * (1 + TAG_BOOST * tag_popularity) / (age_hours + 2) ** gravity
+
+
+class TrendingRanking:
+    """
+    Top posts by trending score, recomputed in the background and kept as an immutable tuple,
+    so requests only slice it. Every refresh is also persisted to the trendingblogs table,
+    which a restarted process loads before its first refresh. With several workers, only the
+    first one due recomputes and saves it; the others load what it saved.
+    """
+
+    def __init__(self, size: int, window_days: int, gravity: float):
+        self.size = size
+        self.window = timedelta(days=window_days)
+        self.gravity = gravity
+        self.posts: tuple[TrendingPost, ...] = ()
+        self.computed_at: datetime | None = None
+
+    def top(self, limit: int) -> list[TrendingPost]:
+        return list(self.posts[:limit])
+
+    def discard(self, blog_id: int) -> None:
+        """Drops a deleted or unpublished post until the next refresh."""
+        self.posts = tuple(post for post in self.posts if post.id != blog_id)
+
+    def rank(self, posts: list, tags: list, now: datetime) -> list[TrendingPost]:
+        post_tags = defaultdict(list)
+        for blog_id, tag_name in tags:
+            post_tags[blog_id].append(tag_name)
+
+        views_by_id = {post.id: post.views for post in posts}
+        tag_views = defaultdict(int)
+        for blog_id, tag_names in post_tags.items():
+            for tag_name in tag_names:
+                tag_views[tag_name] += views_by_id.get(blog_id, 0)
+        max_tag_views = max(tag_views.values(), default=0) or 1
+
+        scored = []
+        for post in posts:
+            age_hours = max((now - post.created_at).total_seconds() / 3600, 0.0)
+            tag_popularity = max((tag_views[name] for name in post_tags[post.id]), default=0) / max_tag_views
+            score = trending_score(post.views, age_hours, tag_popularity, self.gravity)
+            scored.append(TrendingPost(post.id, post.title, post.short_description, post.views, score))
+        return heapq.nlargest(self.size, scored, key=lambda post: (post.score, post.id))
+
+    async def load(self) -> None:
+        try:
+            async with session_manager.create_session(read_only=True) as session:
+                rows = await TrendingDAO.get_snapshot(session=session)
+        except SQLAlchemyError as e:
+            logger.warning(f"Trending snapshot not loaded: {e}")
+            return
+        self.posts = tuple(TrendingPost(*row) for row in rows)
+        logger.info(f"Trending snapshot loaded: {len(self.posts)} blogs")
+
+    async def refresh(self, fresh_for: float = 0.0) -> int:
+        """
+        Recomputes and saves the ranking, unless another worker claimed a refresh less than `fresh_for`
+        seconds ago; the ranking it saved is loaded instead.
+        """
+        # created_at is stored as naive UTC (CURRENT_TIMESTAMP)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        async with session_manager.create_session() as session:
+            async with session_manager.transaction(session):
+                # A worker that waited for the winner's claim finds it fresh and loads the saved ranking
+                claimed = await ScheduledJobDAO.claim(
+                    session=session, name=TRENDING_JOB, now=now, interval=timedelta(seconds=fresh_for),
+                )
+                if not claimed:
+                    ranked = None
+                else:
+                    posts, tags = await TrendingDAO.get_candidates(session=session, since=now - self.window)
+                    ranked = self.rank(posts, tags, now)
+                    await TrendingDAO.replace_snapshot(
+                        session=session,
+                        entries=[
+                            {'blog_id': post.id, 'rank': rank, 'score': post.score}
+                            for rank, post in enumerate(ranked, start=1)
+                        ],
+                    )
+        if ranked is None:
+            await self.load()
+            return len(self.posts)
+        self.posts = tuple(ranked)
+        self.computed_at = now
+        return len(ranked)
+
+    async def run(self, interval: float) -> None:
+        while True:
+            try:
+                # Worker timers drift apart; a snapshot from slightly less than an interval ago is fresh enough
+                ranked = await self.refresh(fresh_for=interval * 0.9)
+                logger.info(f"Trending ranking refreshed: {ranked} blogs")
+            except SQLAlchemyError as e:
+                logger.warning(f"Trending refresh failed: {e}")
+            await asyncio.sleep(interval)
+
+
+trending = TrendingRanking(
+    size=settings.TRENDING_SIZE,
+    window_days=settings.TRENDING_WINDOW_DAYS,
+    gravity=settings.TRENDING_GRAVITY,
+)
@@ -15,4 +15,27 @@ def convert_blog_model(blog: Blog) -> BlogFullResponse:
         ),
         tags=[tag.name for tag in blog.tags],
         created_at=blog.created_at,
-    )
\ No newline at end of file
+        views=blog.views,
+        version=blog.version,
+    )
+
+
+def blog_etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def is_weak_etag(value: str | None) -> bool:
+    return value is not None and value.strip().startswith('W/')
+
+
+def parse_if_match(value: str | None) -> int | None:
+    """
+    Expected blog version from an If-Match header, None when there is none or it is `*`.
+    Only a single strong entity tag is supported; lists and weak tags raise ValueError.
+    """
+    if value is None or value.strip() == '*':
+        return None
+    tag = value.strip()
+    if len(tag) < 3 or tag[0] != '"' or tag[-1] != '"' or not tag[1:-1].isdigit():
+        raise ValueError(f'Invalid If-Match header: {value}')
+    return int(tag[1:-1])
@@ -0,0 +1,84 @@
+import asyncio
+import re
+from collections import Counter
+
+from loguru import logger
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.dao import BlogDAO
+from app.config import settings
+from app.dao.session_maker import session_manager
+
+POST_PAGE_PATH = re.compile(r'^/blogs/(\d+)/$')
+
+
+class ViewCounter:
+    """
+    Buffers post views in memory and writes them back in one batched UPDATE per flush,
+    so viewing a post never writes to the database on the request path.
+    At most `max_pending` distinct posts are buffered between flushes; views of others are dropped.
+    """
+
+    def __init__(self, max_pending: int):
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._pending: Counter[int] = Counter()
+
+    def record(self, blog_id: int, count: int = 1) -> None:
+        if blog_id not in self._pending and len(self._pending) >= self.max_pending:
+            self.dropped += count
+            return
+        self._pending[blog_id] += count
+
+    def pending(self, blog_id: int) -> int:
+        return self._pending[blog_id]
+
+    async def flush(self) -> int:
+        """Writes the buffered views; on a database error they stay buffered for the next flush."""
+        if not self._pending:
+            return 0
+        counts, self._pending = self._pending, Counter()
+        try:
+            async with session_manager.create_session() as session:
+                async with session_manager.transaction(session):
+                    return await BlogDAO.increment_views(session=session, counts=counts)
+        except SQLAlchemyError as e:
+            self._pending.update(counts)
+            logger.warning(f"View counts flush failed, {len(counts)} blogs kept for retry: {e}")
+            return 0
+        except asyncio.CancelledError:
+            self._pending.update(counts)
+            raise
+
+    async def run(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.flush()
+
+
+class ViewCountMiddleware:
+    """
+    Records a view for every successful GET of a post page, whether it was rendered
+    or served from the page cache.
+    """
+
+    def __init__(self, app: ASGIApp, counter: ViewCounter):
+        self.app = app
+        self.counter = counter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        match = POST_PAGE_PATH.match(scope['path']) if scope['type'] == 'http' and scope['method'] == 'GET' else None
+        if match is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_and_count(message: Message) -> None:
+            if message['type'] == 'http.response.start' and message['status'] == 200:
+                self.counter.record(int(match.group(1)))
+            await send(message)
+
+        await self.app(scope, receive, send_and_count)
+
+
+view_counter = ViewCounter(max_pending=settings.VIEW_COUNTS_MAX_PENDING)
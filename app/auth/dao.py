@@ -1,10 +1,100 @@
-from app.dao.base import BaseDAO
+from typing import Any, AsyncIterator, Sequence
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dao.base import BaseDAO, Page
 from app.auth.models import User, Role
 
+# Columns that can be requested from the users listing, the password hash is never selectable
+USER_INFO_COLUMNS = {
+    'id': User.id,
+    'email': User.email,
+    'phone_number': User.phone_number,
+    'first_name': User.first_name,
+    'last_name': User.last_name,
+    'role_id': User.role_id,
+    'role_name': Role.name,
+    'created_at': User.created_at,
+}
+# Same fields as SUserInfo
+DEFAULT_USER_INFO_FIELDS = ('email', 'phone_number', 'first_name', 'last_name', 'id', 'role_name', 'role_id')
+
 
 class UsersDAO(BaseDAO):
     model = User
 
+    @classmethod
+    def _users_info_query(cls, fields: Sequence[str], role_id: int | None):
+        unknown = set(fields) - USER_INFO_COLUMNS.keys()
+        if unknown:
+            raise ValueError(f"Unknown user fields: {', '.join(sorted(unknown))}")
+
+        # "id" is always selected, it is the keyset column
+        columns = [USER_INFO_COLUMNS[field].label(field) for field in dict.fromkeys(['id', *fields])]
+        query = select(*columns).select_from(User)
+        if 'role_name' in fields:
+            query = query.join(Role, User.role_id == Role.id)
+        if role_id is not None:
+            query = query.where(User.role_id == role_id)
+        return query.order_by(User.id)
+
+    @classmethod
+    async def find_users_info_page(
+            cls,
+            session: AsyncSession,
+            page_size: int = 100,
+            cursor: str | None = None,
+            role_id: int | None = None,
+            fields: Sequence[str] = DEFAULT_USER_INFO_FIELDS,
+    ) -> Page[dict[str, Any]]:
+        """
+        Keyset page of users as plain dicts with only the requested `fields`,
+        without hydrating User/Role entities.
+        """
+        logger.info(f"Fetching users page: role_id={role_id}, fields={list(fields)}, page size: {page_size}")
+        ordering = cls._ordering(('id',))
+        query = cls._users_info_query(fields, role_id)
+        if cursor:
+            query = query.where(cls._keyset_condition(ordering, cls.decode_cursor(cursor, ordering)))
+        try:
+            result = await session.execute(query.limit(page_size + 1))
+            rows = result.mappings().all()
+        except SQLAlchemyError as e:
+            logger.error(f"Error while fetching users page: {e}")
+            raise
+
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = cls.encode_cursor([rows[-1]['id']])
+        requested = set(fields)
+        items = [{key: value for key, value in row.items() if key in requested} for row in rows]
+        logger.info(f"Found {len(items)} users on page.")
+        return Page(items=items, page_size=page_size, next_cursor=next_cursor)
+
+    @classmethod
+    async def iterate_users_info(
+            cls,
+            session: AsyncSession,
+            chunk_size: int = 1000,
+            role_id: int | None = None,
+            fields: Sequence[str] = DEFAULT_USER_INFO_FIELDS,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Walks all users in keyset chunks, for exports that don't fit in one response."""
+        cursor = None
+        while True:
+            page = await cls.find_users_info_page(
+                session=session, page_size=chunk_size, cursor=cursor, role_id=role_id, fields=fields,
+            )
+            for item in page.items:
+                yield item
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+
 
 class RoleDAO(BaseDAO):
     model = Role
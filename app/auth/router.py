@@ -1,14 +1,17 @@
-from typing import List
-from fastapi import APIRouter, Response, Depends
+from typing import AsyncIterator
+from fastapi import APIRouter, Response, Depends, Query, HTTPException, status
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
 from app.auth.dependencies import get_current_user, get_current_admin_user
 from app.auth.models import User
-from app.exceptions import UserAlreadyExistsException, IncorrectEmailOrPasswordException
+from app.exceptions import UserAlreadyExistsException, IncorrectEmailOrPasswordException, \
+    InvalidPaginationCursorException
 from app.auth.auth import authenticate_user, create_access_token
-from app.auth.dao import UsersDAO
-from app.auth.schemas import SUserRegister, SUserAuth, EmailModel, SUserAddDB, SUserInfo
+from app.auth.dao import UsersDAO, USER_INFO_COLUMNS, DEFAULT_USER_INFO_FIELDS
+from app.auth.schemas import SUserRegister, SUserAuth, EmailModel, SUserAddDB, SUserInfo, SUsersPage
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dao.session_maker import TransactionSessionDep, SessionDep
+from app.dao.session_maker import TransactionSessionDep, SessionDep, session_manager
 
 router = APIRouter(prefix='/auth', tags=['Auth'])
 
@@ -45,7 +48,35 @@ async def get_me(user_data: User = Depends(get_current_user)) -> SUserInfo:
     return SUserInfo.model_validate(user_data)
 
 
-@router.get("/all_users/")
+@router.get("/all_users/", response_model=SUsersPage)
 async def get_all_users(session: AsyncSession = SessionDep,
-                        user_data: User = Depends(get_current_admin_user)) -> List[SUserInfo]:
-    return await UsersDAO.find_all(session=session, filters=None)
+                        user_data: User = Depends(get_current_admin_user),
+                        cursor: str | None = Query(None, description="Cursor from the previous page"),
+                        page_size: int = Query(100, ge=1, le=1000, description="Records on page"),
+                        role_id: int | None = Query(None, description="Only users with this role"),
+                        fields: list[str] | None = Query(
+                            None, description=f"Fields to return: {', '.join(USER_INFO_COLUMNS)}"),
+                        stream: bool = Query(False, description="Stream all matching users as NDJSON")):
+    fields = fields or list(DEFAULT_USER_INFO_FIELDS)
+    unknown = set(fields) - USER_INFO_COLUMNS.keys()
+    if unknown:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    if stream:
+        return StreamingResponse(_stream_users(role_id, fields), media_type='application/x-ndjson')
+
+    try:
+        page = await UsersDAO.find_users_info_page(
+            session=session, page_size=page_size, cursor=cursor, role_id=role_id, fields=fields,
+        )
+    except ValueError:
+        raise InvalidPaginationCursorException
+    return SUsersPage(users=page.items, next_cursor=page.next_cursor)
+
+
+async def _stream_users(role_id: int | None, fields: list[str]) -> AsyncIterator[bytes]:
+    # The response outlives the request dependencies, so the export uses its own session
+    async with session_manager.create_session() as session:
+        async for user in UsersDAO.iterate_users_info(session=session, role_id=role_id, fields=fields):
+            yield to_json(user) + b'\n'
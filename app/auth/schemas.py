@@ -1,5 +1,5 @@
 import re
-from typing import Self
+from typing import Self, Any
 from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator, model_validator, computed_field
 from app.auth.utils import get_password_hash
 
@@ -58,3 +58,8 @@ class SUserInfo(UserBase):
     @computed_field
     def role_id(self) -> int:
         return self.role.id
+
+
+class SUsersPage(BaseModel):
+    users: list[dict[str, Any]] = Field(description="Users with the requested fields")
+    next_cursor: str | None = Field(default=None, description="Cursor of the next page, empty on the last page")
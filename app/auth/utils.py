@@ -1,11 +1,21 @@
-from passlib.context import CryptContext
+from functools import cache
+from typing import TYPE_CHECKING
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+
+@cache
+def get_pwd_context() -> "CryptContext":
+    # Imported and built on first use: passlib and its bcrypt backend noticeably slow down worker boot
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from loguru import logger
+from sqlalchemy import select, func, delete
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.models import CacheInvalidation
+from app.dao.base import BaseDAO
+
+
+class CacheInvalidationDAO(BaseDAO):
+    model = CacheInvalidation
+
+    @classmethod
+    async def latest_id(cls, session: AsyncSession) -> int:
+        return await session.scalar(select(func.coalesce(func.max(cls.model.id), 0)))
+
+    @classmethod
+    async def fetch_after(cls, session: AsyncSession, after_id: int, limit: int) -> list:
+        """(id, topic, key, origin) rows with id > after_id, oldest first."""
+        result = await session.execute(
+            select(cls.model.id, cls.model.topic, cls.model.key, cls.model.origin)
+            .where(cls.model.id > after_id)
+            .order_by(cls.model.id)
+            .limit(limit)
+        )
+        return list(result.all())
+
+    @classmethod
+    async def prune(cls, session: AsyncSession, before: datetime) -> int:
+        try:
+            # The newest row stays so max(id) never drops below what workers have already seen
+            newest = select(func.max(cls.model.id)).scalar_subquery()
+            result = await session.execute(
+                delete(cls.model).where(cls.model.created_at < before, cls.model.id < newest)
+            )
+            logger.info(f"Cache invalidation log pruned: {result.rowcount} rows")
+            return result.rowcount
+        except SQLAlchemyError as e:
+            logger.error(f"Error while pruning cache invalidation log: {e}")
+            raise
@@ -0,0 +1,121 @@
+import asyncio
+import time
+import uuid
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from loguru import logger
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.dao import CacheInvalidationDAO
+from app.cache.models import CacheInvalidation
+from app.config import settings
+from app.dao.session_maker import after_commit, session_manager
+
+# A blog's content, tags or title changed
+BLOG_CHANGED = 'blog.changed'
+# A blog was deleted or unpublished
+BLOG_REMOVED = 'blog.removed'
+
+
+class InvalidationChannel:
+    """
+    Cross-worker invalidation over the cacheinvalidations table. `publish` writes a row in the
+    caller's transaction and, after commit, notifies this process's subscribers at once; other
+    worker processes poll the table and notify theirs, so every in-process cache drops the change
+    within `poll_interval` seconds.
+    """
+
+    # Ids are allocated at INSERT but become visible at COMMIT, so on PostgreSQL a lower id can
+    # appear after a higher one was read; rows this far behind the newest seen id are read again
+    LOOKBACK = 100
+    BATCH_SIZE = 1000
+
+    def __init__(self, poll_interval: float, retention: float):
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.origin = uuid.uuid4().hex
+        self.last_id = 0
+        self._subscribers: dict[str, list[Callable[[str], None]]] = defaultdict(list)
+        self._seen: deque[int] = deque(maxlen=10 * self.LOOKBACK)
+        self._seen_ids: set[int] = set()
+        self._pruned_at = 0.0
+
+    def subscribe(self, topic: str, callback: Callable[[str], None]) -> None:
+        self._subscribers[topic].append(callback)
+
+    def publish(self, session: AsyncSession, topic: str, key: int | str) -> None:
+        session.add(CacheInvalidation(topic=topic, key=str(key), origin=self.origin))
+        after_commit(session, lambda: self.dispatch(topic, str(key)))
+
+    def dispatch(self, topic: str, key: str) -> None:
+        for callback in self._subscribers.get(topic, ()):
+            try:
+                callback(key)
+            except Exception as e:
+                logger.error(f"Invalidation subscriber failed for {topic} {key}: {e}")
+
+    def _remember(self, change_id: int) -> None:
+        if len(self._seen) == self._seen.maxlen:
+            self._seen_ids.discard(self._seen[0])
+        self._seen.append(change_id)
+        self._seen_ids.add(change_id)
+
+    async def start(self) -> None:
+        # Caches start empty, so earlier changes don't need replaying
+        async with session_manager.create_session(read_only=True) as session:
+            self.last_id = await CacheInvalidationDAO.latest_id(session=session)
+
+    async def poll(self) -> int:
+        """Applies changes published by other processes; returns how many were applied."""
+        applied = 0
+        async with session_manager.create_session(read_only=True) as session:
+            latest_id = await CacheInvalidationDAO.latest_id(session=session)
+            if latest_id < self.last_id:
+                # Ids went back (the table was recreated or emptied without AUTOINCREMENT):
+                # every row is new to this worker
+                logger.warning(f"Cache invalidation ids restarted ({self.last_id} -> {latest_id}), re-reading the log")
+                self.last_id = 0
+                self._seen.clear()
+                self._seen_ids.clear()
+            rows = await CacheInvalidationDAO.fetch_after(
+                session=session, after_id=max(0, self.last_id - self.LOOKBACK), limit=self.BATCH_SIZE,
+            )
+        for change_id, topic, key, origin in rows:
+            if change_id in self._seen_ids:
+                continue
+            self._remember(change_id)
+            self.last_id = max(self.last_id, change_id)
+            if origin != self.origin:
+                self.dispatch(topic, key)
+                applied += 1
+        return applied
+
+    async def prune(self) -> None:
+        # Every worker prunes now and then; deleting the same old rows twice is harmless
+        if time.monotonic() - self._pruned_at < self.retention / 10:
+            return
+        self._pruned_at = time.monotonic()
+        before = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=self.retention)
+        async with session_manager.create_session() as session:
+            async with session_manager.transaction(session):
+                await CacheInvalidationDAO.prune(session=session, before=before)
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                applied = await self.poll()
+                if applied:
+                    logger.info(f"Applied {applied} cache invalidations from other workers")
+                await self.prune()
+            except SQLAlchemyError as e:
+                logger.warning(f"Cache invalidation poll failed: {e}")
+
+
+invalidation = InvalidationChannel(
+    poll_interval=settings.INVALIDATION_POLL_INTERVAL,
+    retention=settings.INVALIDATION_RETENTION,
+)
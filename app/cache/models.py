@@ -0,0 +1,15 @@
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.dao.database import Base
+
+
+class CacheInvalidation(Base):
+    """One committed change that cached copies must drop; `id` orders the log."""
+    topic: Mapped[str] = mapped_column(String(50), nullable=False)
+    key: Mapped[str] = mapped_column(String(100), nullable=False)
+    # Process that published the change; it has already applied it locally
+    origin: Mapped[str] = mapped_column(String(32), nullable=False)
+
+    # Workers poll for ids above the last one they saw: SQLite must not restart ids after a prune
+    __table_args__ = {'sqlite_autoincrement': True}
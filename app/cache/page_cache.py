@@ -0,0 +1,203 @@
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable
+from urllib.parse import parse_qsl, urlencode
+
+from loguru import logger
+from starlette.datastructures import Headers
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.cache.singleflight import SingleFlight
+from app.config import settings
+
+AUTH_COOKIE = 'users_access_token'
+# Pages that look the same for every anonymous visitor
+CACHEABLE_PATH = re.compile(r'^/blogs/(\d+/)?$')
+BLOG_LIST_PATH = '/blogs/'
+
+
+@dataclass
+class CachedPage:
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    stored_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(name) + len(value) for name, value in self.headers)
+
+
+class PageCache:
+    """
+    Size-bounded LRU store of rendered pages. An entry is fresh for `ttl` seconds, then may be
+    served stale for `stale_ttl` more seconds while it is re-rendered in the background.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float, stale_ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: OrderedDict[str, CachedPage] = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> tuple[CachedPage | None, bool]:
+        """Returns (entry, is_fresh); expired entries are dropped."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, False
+        age = time.monotonic() - entry.stored_at
+        if age > self.ttl + self.stale_ttl:
+            self._remove(key)
+            return None, False
+        self._entries.move_to_end(key)
+        return entry, age <= self.ttl
+
+    def set(self, key: str, entry: CachedPage) -> None:
+        if entry.size > self.max_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self, predicate: Callable[[str], bool]) -> int:
+        keys = [key for key in self._entries if predicate(key)]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+
+def cache_key(scope: Scope) -> str:
+    # Query parameters are sorted, so "?tag=a&page=2" and "?page=2&tag=a" share an entry
+    query = parse_qsl(scope.get('query_string', b'').decode('latin-1'), keep_blank_values=True)
+    return f"{scope['path']}?{urlencode(sorted(query))}" if query else scope['path']
+
+
+def is_anonymous(scope: Scope) -> bool:
+    cookie_header = Headers(scope=scope).get('cookie')
+    return not cookie_header or AUTH_COOKIE not in cookie_parser(cookie_header)
+
+
+def is_cacheable_response(page: CachedPage) -> bool:
+    headers = {name.lower(): value.lower() for name, value in page.headers}
+    cache_control = headers.get(b'cache-control', b'')
+    return (
+            page.status == 200
+            and b'set-cookie' not in headers
+            and b'no-store' not in cache_control
+            and b'private' not in cache_control
+    )
+
+
+class PageCacheMiddleware:
+    """
+    Serves anonymous GET requests for cacheable pages from the PageCache. Concurrent misses for the
+    same page are rendered once (single-flight), stale entries are served while being refreshed.
+    Requests carrying the auth cookie always reach the application.
+    """
+
+    def __init__(self, app: ASGIApp, cache: 'PageCache'):
+        self.app = app
+        self.cache = cache
+        self.renders = SingleFlight('page_cache')
+        self._revalidations: set[asyncio.Task] = set()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+                scope['type'] != 'http'
+                or scope['method'] != 'GET'
+                or not CACHEABLE_PATH.match(scope['path'])
+                or not is_anonymous(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        key = cache_key(scope)
+        entry, fresh = self.cache.get(key)
+        if entry is not None:
+            if not fresh and not self.renders.in_flight(key):
+                task = asyncio.create_task(self.renders.do(key, lambda: self._render(key, scope)))
+                self._revalidations.add(task)
+                task.add_done_callback(self._revalidations.discard)
+            await self._send(send, entry, b'HIT' if fresh else b'STALE')
+            return
+
+        page = await self.renders.do(key, lambda: self._render(key, scope))
+        await self._send(send, page, b'MISS')
+
+    async def _render(self, key: str, scope: Scope) -> CachedPage:
+        # Runs the application with a synthetic request body and buffers the whole response
+        page = CachedPage(status=500, headers=[], body=b'')
+        chunks = []
+        request_sent = False
+
+        async def receive() -> Message:
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            # Never disconnects: the response is rendered for the cache, not for one client
+            await asyncio.Event().wait()
+
+        async def send(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                page.status = message['status']
+                page.headers = [
+                    (name, value) for name, value in message.get('headers', []) if name.lower() != b'content-length'
+                ]
+            elif message['type'] == 'http.response.body':
+                chunks.append(message.get('body', b''))
+
+        await self.app(dict(scope), receive, send)
+        page.body = b''.join(chunks)
+        page.stored_at = time.monotonic()
+        if is_cacheable_response(page):
+            self.cache.set(key, page)
+        return page
+
+    @staticmethod
+    async def _send(send: Send, page: CachedPage, cache_status: bytes) -> None:
+        headers = [
+            *page.headers,
+            (b'content-length', str(len(page.body)).encode()),
+            (b'x-page-cache', cache_status),
+        ]
+        await send({'type': 'http.response.start', 'status': page.status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': page.body})
+
+
+page_cache = PageCache(
+    max_bytes=settings.PAGE_CACHE_MAX_BYTES,
+    ttl=settings.PAGE_CACHE_TTL,
+    stale_ttl=settings.PAGE_CACHE_STALE_TTL,
+)
+
+
+def invalidate_blog_pages(blog_id: int | None = None) -> None:
+    """Drops the cached page of a blog and every list page, which may show or count it."""
+    blog_path = f"/blogs/{blog_id}/"
+
+    def affected(key: str) -> bool:
+        path = key.split('?', 1)[0]
+        return path == BLOG_LIST_PATH or path == blog_path
+
+    removed = page_cache.invalidate(affected)
+    logger.info(f"Page cache invalidated for blog {blog_id}: {removed} pages removed")
@@ -0,0 +1,96 @@
+import asyncio
+import inspect
+from functools import wraps
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+R = TypeVar("R")
+
+# Every SingleFlight by name, for metrics
+flights: dict[str, "SingleFlight"] = {}
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time: callers arriving while a call for the same key
+    is in flight wait for it and share its result (or exception) instead of running their own.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        self.executed = 0
+        self.coalesced = 0
+        flights[name] = self
+
+    def stats(self) -> dict:
+        return {'executed': self.executed, 'coalesced': self.coalesced, 'in_flight': len(self._calls)}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[R]]) -> R:
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                return await self._lead(key, fn)
+
+            self.coalesced += 1
+            try:
+                # Shielded: a waiter giving up must not cancel the call other waiters depend on
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                # The leading caller was cancelled, not us: retry, possibly as the new leader
+
+    async def _lead(self, key: Hashable, fn: Callable[[], Awaitable[R]]) -> R:
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.executed += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieved here, so asyncio doesn't log it when nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+
+def coalesce_reads(fn: Callable[..., Awaitable[R]]) -> Callable[..., Awaitable[R]]:
+    """
+    Decorator for DAO read methods: concurrent calls with the same arguments on the same database
+    share one query and its result. Only calls on read-only sessions are coalesced, a session with
+    its own pending writes must never see, or leak, another session's view; nor are sticky sessions
+    (a client reading its own write must not join a query started before it). The shared result is
+    handed to several sessions, so the method must return detached data, not ORM instances.
+    Apply below @classmethod.
+    """
+    signature = inspect.signature(fn)
+    flight = SingleFlight(fn.__qualname__)
+
+    @wraps(fn)
+    async def wrapper(*args, **kwargs) -> R:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        session = bound.arguments.get('session')
+        if not isinstance(session, AsyncSession) or not session.info.get('read_only') or session.info.get('sticky'):
+            return await fn(*args, **kwargs)
+
+        # The primary and each replica may be at different points in time
+        key = (id(session.bind),) + tuple(
+            value for name, value in bound.arguments.items() if name not in ('cls', 'session')
+        )
+        return await flight.do(key, lambda: fn(*args, **kwargs))
+
+    return wrapper
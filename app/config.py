@@ -5,6 +5,61 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     BASE_DIR: str = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
     DB_URL: str = f"sqlite+aiosqlite:///{BASE_DIR}/data/db.sqlite3"
+    DB_POOL_PREFILL: int = 5
+    # PostgreSQL profile (DB_URL=postgresql+asyncpg://...); ignored by SQLite
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800
+    # Prepared statements cached per asyncpg connection; 0 behind PgBouncer in transaction mode
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500
+    # Read replicas for SessionDep; "round_robin" or "least_connections"
+    DB_REPLICA_URLS: list[str] = []
+    DB_REPLICA_SELECTION: str = 'round_robin'
+    DB_REPLICA_HEALTH_CHECK_INTERVAL: float = 10.0
+    # After a write, reads from the same client go to the primary for this many seconds
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0
+    # Templates are only re-read from disk when this is enabled (development)
+    TEMPLATES_AUTO_RELOAD: bool = False
+    # Directory for compiled template bytecode, a per-user temporary directory by default
+    TEMPLATES_BYTECODE_CACHE_DIR: str | None = None
+    # Full-page cache for anonymous visitors; entries are served stale while re-rendered
+    PAGE_CACHE_ENABLED: bool = True
+    PAGE_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    PAGE_CACHE_TTL: float = 30.0
+    PAGE_CACHE_STALE_TTL: float = 300.0
+    # Token-bucket rate limits and admission control (MAX_CONCURRENT_REQUESTS=0 disables it)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_LOGIN_PER_MINUTE: int = 10
+    RATE_LIMIT_WRITES_PER_MINUTE: int = 60
+    RATE_LIMIT_IP_PER_SECOND: float = 50.0
+    MAX_CONCURRENT_REQUESTS: int = 100
+    # Post views are buffered in memory and written back every VIEW_COUNTS_FLUSH_INTERVAL seconds
+    VIEW_COUNTS_FLUSH_INTERVAL: float = 5.0
+    VIEW_COUNTS_MAX_PENDING: int = 10_000
+    # Trending ranking: top TRENDING_SIZE published posts of the last TRENDING_WINDOW_DAYS days
+    TRENDING_REFRESH_INTERVAL: float = 60.0
+    TRENDING_SIZE: int = 50
+    TRENDING_WINDOW_DAYS: int = 30
+    TRENDING_GRAVITY: float = 1.5
+    # Related posts index, rebuilt from blogtags every RELATED_POSTS_REBUILD_INTERVAL seconds
+    RELATED_POSTS_LIMIT: int = 5
+    RELATED_POSTS_REBUILD_INTERVAL: float = 600.0
+    # Archival job: moves deleted blogs and stale drafts from blogs to blogs_archive
+    ARCHIVE_INTERVAL: float = 3600.0
+    ARCHIVE_DELETED_AFTER_DAYS: int = 7
+    ARCHIVE_DRAFTS_AFTER_DAYS: int = 365
+    ARCHIVE_BATCH_SIZE: int = 500
+    # `python -m app` server; each of SERVER_WORKERS processes keeps its own in-memory caches
+    SERVER_HOST: str = '127.0.0.1'
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 1
+    SERVER_FORWARDED_ALLOW_IPS: str = '127.0.0.1'
+    # Workers apply each other's cache invalidations every INVALIDATION_POLL_INTERVAL seconds (0 disables)
+    INVALIDATION_POLL_INTERVAL: float = 1.0
+    INVALIDATION_RETENTION: float = 3600.0
+    # Blog change log (GET /api/changes): longest long-poll wait, rows kept for CHANGES_RETENTION_DAYS
+    CHANGES_MAX_WAIT: float = 30.0
+    CHANGES_RETENTION_DAYS: int = 30
     SECRET_KEY: str
     ALGORITHM: str
 
@@ -13,3 +68,4 @@ class Settings(BaseSettings):
 
 settings = Settings()
 database_url = settings.DB_URL
+replica_urls = settings.DB_REPLICA_URLS
@@ -1,8 +1,17 @@
-from typing import List, Any, TypeVar, Generic
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import List, Any, TypeVar, Generic, Sequence, AsyncIterator, Callable, Hashable
 from pydantic import BaseModel
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.future import select
-from sqlalchemy import update as sqlalchemy_update, delete as sqlalchemy_delete, func
+from sqlalchemy import update as sqlalchemy_update, delete as sqlalchemy_delete, func, and_, or_, tuple_, bindparam
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.sql import Executable
+from sqlalchemy.sql.elements import ColumnElement
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 from .database import Base
@@ -10,17 +19,70 @@ from .database import Base
 # Declare a type variable T with a constraint that it is a subclass of Base
 T = TypeVar("T", bound=Base)
 
+# Ordering spec: column names, a leading "-" means descending, e.g. ("-created_at", "id")
+OrderBy = Sequence[str]
+
+# Prebuilt statements per (model, query shape); values are passed as bound parameters at execution
+_statement_cache: dict[tuple, Executable] = {}
+# INSERT constructs with ON CONFLICT support, by dialect name
+_on_conflict_inserts = {
+    'postgresql': postgresql_insert,
+    'sqlite': sqlite_insert,
+}
+
+
+@dataclass
+class Page(Generic[T]):
+    """One keyset page: `next_cursor` is None on the last page."""
+    items: list[T]
+    page_size: int
+    next_cursor: str | None = None
+
 
 class BaseDAO(Generic[T]):
     model: type[T]
 
+    @classmethod
+    def cached_statement(cls, shape: Hashable, build: Callable[[], Executable]) -> Executable:
+        """
+        Returns the statement for a query shape of this model, building it only once.
+        Reusing the construct skips per-call query building; SQLAlchemy's compiled cache does the rest.
+        """
+        key = (cls.model, shape)
+        statement = _statement_cache.get(key)
+        if statement is None:
+            statement = _statement_cache[key] = build()
+        return statement
+
+    @classmethod
+    def visible(cls) -> tuple[ColumnElement[bool], ...]:
+        """Conditions applied by every read of this DAO; DAOs of soft-deleted models override it."""
+        return ()
+
+    @classmethod
+    def _select_by(cls, filter_dict: dict, count: bool = False) -> tuple[Executable, dict]:
+        # SELECT (or SELECT count) filtered by equality on the given columns, as a cached statement plus its parameters
+        def base():
+            return (select(func.count(cls.model.id)) if count else select(cls.model)).where(*cls.visible())
+
+        if any(value is None for value in filter_dict.values()):
+            # "IS NULL" can't be expressed with a bound parameter
+            return base().filter_by(**filter_dict), {}
+
+        names = tuple(sorted(filter_dict))
+        statement = cls.cached_statement(
+            ('select_by', names, count),
+            lambda: base().where(*[getattr(cls.model, name) == bindparam(f'filter_{name}') for name in names]),
+        )
+        return statement, {f'filter_{name}': value for name, value in filter_dict.items()}
+
     @classmethod
     async def find_one_or_none_by_id(cls, data_id: int, session: AsyncSession):
         # Find a record by ID
         logger.info(f"Searching for {cls.model.__name__} with ID: {data_id}")
         try:
-            query = select(cls.model).filter_by(id=data_id)
-            result = await session.execute(query)
+            query, params = cls._select_by({'id': data_id})
+            result = await session.execute(query, params)
             record = result.scalar_one_or_none()
             if record:
                 logger.info(f"Record with ID {data_id} found.")
@@ -37,8 +99,8 @@ class BaseDAO(Generic[T]):
         filter_dict = filters.model_dump(exclude_unset=True)
         logger.info(f"Searching for one {cls.model.__name__} record with filters: {filter_dict}")
         try:
-            query = select(cls.model).filter_by(**filter_dict)
-            result = await session.execute(query)
+            query, params = cls._select_by(filter_dict)
+            result = await session.execute(query, params)
             record = result.scalar_one_or_none()
             if record:
                 logger.info(f"Record found with filters: {filter_dict}")
@@ -58,8 +120,8 @@ class BaseDAO(Generic[T]):
             filter_dict = {}
         logger.info(f"Searching for all {cls.model.__name__} records with filters: {filter_dict}")
         try:
-            query = select(cls.model).filter_by(**filter_dict)
-            result = await session.execute(query)
+            query, params = cls._select_by(filter_dict)
+            result = await session.execute(query, params)
             records = result.scalars().all()
             logger.info(f"Found {len(records)} records.")
             return records
@@ -147,8 +209,8 @@ class BaseDAO(Generic[T]):
         filter_dict = filters.model_dump(exclude_unset=True)
         logger.info(f"Counting {cls.model.__name__} records with filter: {filter_dict}")
         try:
-            query = select(func.count(cls.model.id)).filter_by(**filter_dict)
-            result = await session.execute(query)
+            query, params = cls._select_by(filter_dict, count=True)
+            result = await session.execute(query, params)
             count = result.scalar()
             logger.info(f"Found {count} records.")
             return count
@@ -157,27 +219,128 @@ class BaseDAO(Generic[T]):
             raise
 
     @classmethod
-    async def paginate(cls, session: AsyncSession, page: int = 1, page_size: int = 10, filters: BaseModel = None):
-        # Paginate records
+    def _ordering(cls, order_by: OrderBy) -> list[tuple[Any, bool]]:
+        # Resolve an ordering spec into (column, descending) pairs, "id" is always the final tie-breaker
+        names = list(order_by)
+        if not any(name.lstrip('-') == 'id' for name in names):
+            names.append('id')
+        ordering = []
+        for name in names:
+            column = getattr(cls.model, name.lstrip('-'), None)
+            if column is None:
+                raise ValueError(f"{cls.model.__name__} has no column '{name.lstrip('-')}' to order by")
+            ordering.append((column, name.startswith('-')))
+        return ordering
+
+    @staticmethod
+    def _keyset_condition(ordering: list[tuple[Any, bool]], values: list[Any]) -> ColumnElement[bool]:
+        # Rows strictly after `values` in the given ordering
+        directions = {descending for _, descending in ordering}
+        if len(directions) == 1:
+            columns, values_tuple = tuple_(*[column for column, _ in ordering]), tuple_(*values)
+            return columns < values_tuple if directions.pop() else columns > values_tuple
+
+        conditions = []
+        for i, (column, descending) in enumerate(ordering):
+            equal_prefix = [ordering[j][0] == values[j] for j in range(i)]
+            after = column < values[i] if descending else column > values[i]
+            conditions.append(and_(*equal_prefix, after))
+        return or_(*conditions)
+
+    @staticmethod
+    def encode_cursor(values: list[Any]) -> str:
+        payload = json.dumps([v.isoformat() if isinstance(v, (date, datetime)) else v for v in values])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str, ordering: list[tuple[Any, bool]]) -> list[Any]:
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise ValueError('Invalid pagination cursor')
+        if not isinstance(values, list) or len(values) != len(ordering):
+            raise ValueError('Invalid pagination cursor')
+
+        decoded = []
+        for value, (column, _) in zip(values, ordering):
+            python_type = column.type.python_type
+            # A value of the wrong type would compare as "no rows" on SQLite and fail on PostgreSQL
+            if python_type in (datetime, date) and isinstance(value, str):
+                value = python_type.fromisoformat(value)
+            elif python_type is float and isinstance(value, int) and not isinstance(value, bool):
+                value = float(value)
+            if not isinstance(value, python_type) or (isinstance(value, bool) and python_type is not bool):
+                raise ValueError('Invalid pagination cursor')
+            decoded.append(value)
+        return decoded
+
+    @classmethod
+    async def paginate(
+            cls,
+            session: AsyncSession,
+            page_size: int = 10,
+            filters: BaseModel | None = None,
+            order_by: OrderBy = ('id',),
+            cursor: str | None = None,
+    ) -> Page[T]:
+        """
+        Keyset pagination: returns up to `page_size` records after `cursor` in a stable order.
+        Ordering columns should be non-nullable; "id" is appended as a tie-breaker.
+        """
         filter_dict = filters.model_dump(exclude_unset=True) if filters else {}
+        ordering = cls._ordering(order_by)
         logger.info(
-            f"Paginating {cls.model.__name__} records with filter: {filter_dict}, page: {page}, page size: {page_size}")
+            f"Paginating {cls.model.__name__} records with filter: {filter_dict}, order: {list(order_by)}, "
+            f"page size: {page_size}, cursor: {cursor}")
         try:
-            query = select(cls.model).filter_by(**filter_dict)
-            result = await session.execute(query.offset((page - 1) * page_size).limit(page_size))
-            records = result.scalars().all()
-            logger.info(f"Found {len(records)} records on page {page}.")
-            return records
+            query = select(cls.model).where(*cls.visible()).filter_by(**filter_dict)
+            if cursor:
+                query = query.where(cls._keyset_condition(ordering, cls.decode_cursor(cursor, ordering)))
+            query = query.order_by(*[column.desc() if descending else column for column, descending in ordering])
+
+            # One extra row tells whether there is a next page
+            result = await session.execute(query.limit(page_size + 1))
+            records = list(result.scalars().all())
+            next_cursor = None
+            if len(records) > page_size:
+                records = records[:page_size]
+                last = records[-1]
+                next_cursor = cls.encode_cursor([getattr(last, column.key) for column, _ in ordering])
+            logger.info(f"Found {len(records)} records on page.")
+            return Page(items=records, page_size=page_size, next_cursor=next_cursor)
         except SQLAlchemyError as e:
             logger.error(f"Error while paginating records: {e}")
             raise
 
+    @classmethod
+    async def iterate_all(
+            cls,
+            session: AsyncSession,
+            chunk_size: int = 1000,
+            filters: BaseModel | None = None,
+            order_by: OrderBy = ('id',),
+    ) -> AsyncIterator[T]:
+        """Walks all matching records in keyset chunks, so memory and per-query cost stay O(chunk)."""
+        cursor = None
+        while True:
+            page = await cls.paginate(
+                session=session, page_size=chunk_size, filters=filters, order_by=order_by, cursor=cursor,
+            )
+            for record in page.items:
+                yield record
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+            # Processed chunks are no longer needed in the identity map
+            for record in page.items:
+                session.expunge(record)
+
     @classmethod
     async def find_by_ids(cls, session: AsyncSession, ids: List[int]) -> List[Any]:
         """Find multiple records by a list of IDs"""
         logger.info(f"Searching for {cls.model.__name__} records by list of IDs: {ids}")
         try:
-            query = select(cls.model).filter(cls.model.id.in_(ids))
+            query = select(cls.model).where(*cls.visible()).filter(cls.model.id.in_(ids))
             result = await session.execute(query)
             records = result.scalars().all()
             logger.info(f"Found {len(records)} records by list of IDs.")
@@ -186,15 +349,56 @@ class BaseDAO(Generic[T]):
             logger.error(f"Error while searching for records by list of IDs: {e}")
             raise
 
+    @classmethod
+    async def add_if_missing(cls, session: AsyncSession, unique_fields: List[str], values: dict) -> None:
+        """
+        Inserts a record unless one with the same `unique_fields` exists. On PostgreSQL and SQLite it is
+        one INSERT ... ON CONFLICT DO NOTHING, safe against concurrent inserts; other databases select first.
+        """
+        dialect_insert = _on_conflict_inserts.get(session.get_bind().dialect.name)
+        try:
+            if dialect_insert is not None:
+                await session.execute(
+                    dialect_insert(cls.model).values(**values).on_conflict_do_nothing(index_elements=unique_fields)
+                )
+                return
+            filter_dict = {field: values[field] for field in unique_fields}
+            if await session.scalar(select(cls.model.id).filter_by(**filter_dict)) is None:
+                session.add(cls.model(**values))
+                await session.flush()
+        except SQLAlchemyError as e:
+            logger.error(f"Error while adding a missing {cls.model.__name__} record: {e}")
+            raise
+
     @classmethod
     async def upsert(cls, session: AsyncSession, unique_fields: List[str], values: BaseModel):
-        """Create or update a record"""
+        """
+        Create or update a record. On PostgreSQL and SQLite it is one INSERT ... ON CONFLICT DO UPDATE,
+        so `unique_fields` must be covered by a unique constraint; other databases select first.
+        """
         values_dict = values.model_dump(exclude_unset=True)
         filter_dict = {field: values_dict[field] for field in unique_fields if field in values_dict}
 
         logger.info(f"Upsert for {cls.model.__name__}")
+        dialect_insert = _on_conflict_inserts.get(session.get_bind().dialect.name)
         try:
-            existing = await cls.find_one_or_none(session, BaseModel.construct(**filter_dict))
+            if dialect_insert is not None:
+                update_values = {key: value for key, value in values_dict.items() if key not in unique_fields}
+                # ON CONFLICT DO UPDATE doesn't apply column onupdate defaults
+                update_values['updated_at'] = func.now()
+                query = (
+                    dialect_insert(cls.model)
+                    .values(**values_dict)
+                    .on_conflict_do_update(index_elements=unique_fields, set_=update_values)
+                    .returning(cls.model)
+                )
+                result = await session.execute(query, execution_options={'populate_existing': True})
+                record = result.scalar_one()
+                logger.info(f"Upserted {cls.model.__name__} record")
+                return record
+
+            result = await session.execute(select(cls.model).filter_by(**filter_dict))
+            existing = result.scalar_one_or_none()
             if existing:
                 # Update existing record
                 for key, value in values_dict.items():
@@ -1,16 +1,92 @@
 from datetime import datetime
 from typing import Dict, Any, Annotated
-from sqlalchemy import func, TIMESTAMP, Integer
+
+from loguru import logger
+from sqlalchemy import event, func, TIMESTAMP, Integer, text
 from sqlalchemy.orm import Mapped, mapped_column, DeclarativeBase, declared_attr
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncAttrs, async_sessionmaker, create_async_engine, AsyncSession
+from sqlalchemy.pool import NullPool
+
+from app.config import database_url, replica_urls, settings
+
+
+def engine_options(url: str) -> dict:
+    """create_async_engine arguments for the database of `url`; SQLite keeps SQLAlchemy's defaults."""
+    if make_url(url).get_backend_name() != 'postgresql':
+        return {}
+    options = {
+        'pool_size': settings.DB_POOL_SIZE,
+        'max_overflow': settings.DB_MAX_OVERFLOW,
+        'pool_recycle': settings.DB_POOL_RECYCLE,
+        'pool_pre_ping': True,
+    }
+    # Timestamps are TIMESTAMP WITHOUT TIME ZONE filled by now(), and the application compares them
+    # with naive UTC: the session time zone must be UTC whatever the server's default is
+    if make_url(url).get_driver_name() == 'asyncpg':
+        options['connect_args'] = {
+            'prepared_statement_cache_size': settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+            'server_settings': {'application_name': 'fast_api_blog', 'timezone': 'UTC'},
+        }
+    else:
+        options['connect_args'] = {'options': '-c timezone=UTC'}
+    return options
 
-from app.config import database_url
 
-engine = create_async_engine(url=database_url)
+engine = create_async_engine(url=database_url, **engine_options(database_url))
 async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+replica_engines = [create_async_engine(url=url, **engine_options(url)) for url in replica_urls]
+replica_session_makers = [
+    async_sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False)
+    for replica_engine in replica_engines
+]
 str_uniq = Annotated[str, mapped_column(unique=True, nullable=False)]
 
 
+def enable_sqlite_foreign_keys(dbapi_connection, connection_record) -> None:
+    # SQLite ignores foreign keys, and so ON DELETE CASCADE, unless enabled on every connection
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.close()
+
+
+for sqlite_engine in (engine, *replica_engines):
+    if sqlite_engine.dialect.name == 'sqlite':
+        event.listen(sqlite_engine.sync_engine, 'connect', enable_sqlite_foreign_keys)
+
+
+async def prefill_pool(size: int) -> int:
+    """
+    Opens up to `size` connections per engine (primary and replicas) and returns them to the pool,
+    so the first requests after startup don't pay the connect cost. Returns the number of connections opened.
+    Engines without a pool (file SQLite uses NullPool) are skipped: their connections are closed on release.
+    """
+    opened = 0
+    for pooled_engine in (engine, *replica_engines):
+        if isinstance(pooled_engine.pool, NullPool):
+            logger.debug(f"Pool pre-fill skipped for {pooled_engine.url.render_as_string()}: no connection pool")
+            continue
+        pool_size = getattr(pooled_engine.pool, 'size', None)
+        engine_size = min(size, pool_size()) if callable(pool_size) else size
+
+        connections = []
+        try:
+            for _ in range(engine_size):
+                connection = await pooled_engine.connect()
+                connections.append(connection)
+                await connection.execute(text('SELECT 1'))
+        finally:
+            for connection in connections:
+                await connection.close()
+        opened += len(connections)
+    return opened
+
+
+async def dispose_engines() -> None:
+    for pooled_engine in (engine, *replica_engines):
+        await pooled_engine.dispose()
+
+
 class Base(AsyncAttrs, DeclarativeBase):
     __abstract__ = True
 
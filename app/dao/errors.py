@@ -0,0 +1,51 @@
+from sqlalchemy.exc import IntegrityError
+
+UNIQUE_VIOLATION = 'unique_violation'
+FOREIGN_KEY_VIOLATION = 'foreign_key_violation'
+NOT_NULL_VIOLATION = 'not_null_violation'
+CHECK_VIOLATION = 'check_violation'
+OTHER_VIOLATION = 'other_violation'
+
+# PostgreSQL SQLSTATE codes (asyncpg, psycopg)
+_SQLSTATES = {
+    '23505': UNIQUE_VIOLATION,
+    '23503': FOREIGN_KEY_VIOLATION,
+    '23502': NOT_NULL_VIOLATION,
+    '23514': CHECK_VIOLATION,
+}
+
+# SQLite extended result codes, and the message prefixes of the same errors
+_SQLITE_ERRORS = {
+    'SQLITE_CONSTRAINT_UNIQUE': UNIQUE_VIOLATION,
+    'SQLITE_CONSTRAINT_PRIMARYKEY': UNIQUE_VIOLATION,
+    'SQLITE_CONSTRAINT_FOREIGNKEY': FOREIGN_KEY_VIOLATION,
+    'SQLITE_CONSTRAINT_NOTNULL': NOT_NULL_VIOLATION,
+    'SQLITE_CONSTRAINT_CHECK': CHECK_VIOLATION,
+}
+_SQLITE_MESSAGES = {
+    'UNIQUE constraint failed': UNIQUE_VIOLATION,
+    'FOREIGN KEY constraint failed': FOREIGN_KEY_VIOLATION,
+    'NOT NULL constraint failed': NOT_NULL_VIOLATION,
+    'CHECK constraint failed': CHECK_VIOLATION,
+}
+
+
+def classify_integrity_error(error: IntegrityError) -> str:
+    """Kind of constraint an IntegrityError violated, the same for every supported database."""
+    orig = error.orig
+    sqlstate = getattr(orig, 'sqlstate', None) or getattr(orig, 'pgcode', None)
+    if sqlstate:
+        return _SQLSTATES.get(sqlstate, OTHER_VIOLATION)
+
+    error_name = getattr(orig, 'sqlite_errorname', None)
+    if error_name in _SQLITE_ERRORS:
+        return _SQLITE_ERRORS[error_name]
+    message = str(orig)
+    for prefix, kind in _SQLITE_MESSAGES.items():
+        if message.startswith(prefix):
+            return kind
+    return OTHER_VIOLATION
+
+
+def is_unique_violation(error: IntegrityError) -> bool:
+    return classify_integrity_error(error) == UNIQUE_VIOLATION
@@ -1,29 +1,155 @@
+import asyncio
+import itertools
+import time
 from contextlib import asynccontextmanager
-from typing import Callable, Optional, AsyncGenerator
-from fastapi import Depends
+from typing import Awaitable, Callable, Optional, AsyncGenerator, Sequence
+from fastapi import Depends, Request
 from loguru import logger
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 from sqlalchemy import text
 from functools import wraps
 
-from app.dao.database import async_session_maker
+from app.config import settings
+from app.dao.database import async_session_maker, replica_session_makers
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """
+    Registers a callback to run once the session's transaction is committed by the session manager,
+    e.g. cache invalidation that must not run before the new data is visible. Dropped on rollback.
+    """
+    session.info.setdefault('after_commit', []).append(callback)
+
+
+def before_commit(session: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+    """
+    Registers a coroutine to run as the last work of the session's transaction, right before the
+    session manager commits it; an error rolls the transaction back. Dropped on rollback.
+    """
+    session.info.setdefault('before_commit', []).append(callback)
+
+
+async def run_before_commit(session: AsyncSession) -> None:
+    for callback in session.info.pop('before_commit', []):
+        await callback()
+
+
+def run_after_commit(session: AsyncSession) -> None:
+    for callback in session.info.pop('after_commit', []):
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f"Error in after-commit callback {callback!r}: {e}")
+
+
+# Requests with these methods share a read-only session
+READ_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+
+class Replica:
+    """A read replica with its in-flight session count and health state."""
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession]):
+        self.session_maker = session_maker
+        self.in_flight = 0
+        self.healthy = True
+
+    def __repr__(self) -> str:
+        return f"<Replica(url={self.session_maker.kw['bind'].url!r}, healthy={self.healthy}, in_flight={self.in_flight})>"
 
 
 class DatabaseSessionManager:
     """
     Class for managing asynchronous database sessions, including support for transactions and FastAPI dependencies.
+
+    Read-only sessions (`SessionDep`) are routed to healthy replicas when they are configured,
+    transactional sessions always use the primary. After a client's write its reads stick to the
+    primary for `sticky_seconds`, so it reads its own writes despite replication lag.
     """
 
-    def __init__(self, session_maker: async_sessionmaker[AsyncSession]):
+    def __init__(
+            self,
+            session_maker: async_sessionmaker[AsyncSession],
+            replica_session_makers: Sequence[async_sessionmaker[AsyncSession]] = (),
+            replica_selection: str = 'round_robin',
+            sticky_seconds: float = 5.0,
+    ):
+        if replica_selection not in ('round_robin', 'least_connections'):
+            raise ValueError(f"Unknown replica selection strategy: {replica_selection}")
         self.session_maker = session_maker
+        self.replicas = [Replica(replica_session_maker) for replica_session_maker in replica_session_makers]
+        self.replica_selection = replica_selection
+        self.sticky_seconds = sticky_seconds
+        self._round_robin = itertools.count()
+        self._sticky_until: dict[str, float] = {}
+
+    def select_replica(self) -> Replica | None:
+        """Returns a healthy replica, or None when reads have to go to the primary."""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        if self.replica_selection == 'least_connections':
+            return min(healthy, key=lambda replica: replica.in_flight)
+        return healthy[next(self._round_robin) % len(healthy)]
+
+    @staticmethod
+    def client_key(request: Request) -> str:
+        # Logged-in users are tracked by their token, anonymous clients by address
+        token = request.cookies.get('users_access_token')
+        if token:
+            return f"token:{token}"
+        return f"client:{request.client.host if request.client else 'unknown'}"
+
+    def mark_write(self, key: str) -> None:
+        """
+        Pins the client's reads to the primary for `sticky_seconds` after a write. Tracked without
+        replicas too: reads of a sticky client are never coalesced with reads started before its write.
+        """
+        if self.sticky_seconds <= 0:
+            return
+        now = time.monotonic()
+        if len(self._sticky_until) > 10_000:
+            self._sticky_until = {k: until for k, until in self._sticky_until.items() if until > now}
+        self._sticky_until[key] = now + self.sticky_seconds
+
+    def is_sticky(self, key: str) -> bool:
+        until = self._sticky_until.get(key)
+        if until is None:
+            return False
+        if until <= time.monotonic():
+            self._sticky_until.pop(key, None)
+            return False
+        return True
+
+    async def check_replicas(self) -> None:
+        """Health check: a replica is usable when it answers `SELECT 1`."""
+        for replica in self.replicas:
+            try:
+                async with replica.session_maker() as session:
+                    await asyncio.wait_for(session.execute(text('SELECT 1')), timeout=5)
+                if not replica.healthy:
+                    logger.info(f"Replica is healthy again: {replica}")
+                replica.healthy = True
+            except (DBAPIError, OSError, asyncio.TimeoutError) as e:
+                if replica.healthy:
+                    replica.healthy = False
+                    logger.warning(f"Replica marked unhealthy: {replica}: {e}")
+
+    async def run_health_checks(self, interval: float) -> None:
+        """Background task re-checking replicas every `interval` seconds."""
+        while True:
+            await self.check_replicas()
+            await asyncio.sleep(interval)
 
     @asynccontextmanager
-    async def create_session(self) -> AsyncGenerator[AsyncSession, None]:
+    async def create_session(self, read_only: bool = False) -> AsyncGenerator[AsyncSession, None]:
         """
         Creates and provides a new database session.
         Ensures the session is closed after usage.
+        A `read_only` session never autoflushes; it is not committed, closing it releases the connection.
         """
-        async with self.session_maker() as session:
+        async with self.session_maker(**self._session_kwargs(read_only)) as session:
             try:
                 yield session
             except Exception as e:
@@ -32,6 +158,42 @@ class DatabaseSessionManager:
             finally:
                 await session.close()
 
+    @staticmethod
+    def _session_kwargs(read_only: bool) -> dict:
+        return {'autoflush': False, 'info': {'read_only': True}} if read_only else {}
+
+    @asynccontextmanager
+    async def create_read_session(self, sticky_key: str | None = None) -> AsyncGenerator[AsyncSession, None]:
+        """
+        Creates a read-only session: on a replica when one is healthy and the client
+        isn't pinned to the primary, otherwise on the primary.
+        """
+        sticky = bool(sticky_key) and self.is_sticky(sticky_key)
+        replica = None if sticky else self.select_replica()
+        if replica is None:
+            async with self.create_session(read_only=True) as session:
+                # Read-your-writes: excluded from single-flight coalescing
+                session.info['sticky'] = sticky
+                yield session
+            return
+
+        replica.in_flight += 1
+        try:
+            async with replica.session_maker(**self._session_kwargs(read_only=True)) as session:
+                try:
+                    yield session
+                except DBAPIError as e:
+                    if e.connection_invalidated:
+                        replica.healthy = False
+                        logger.warning(f"Replica marked unhealthy after a lost connection: {replica}")
+                    logger.error(f"Error while using a replica session: {e}")
+                    raise
+                except Exception as e:
+                    logger.error(f"Error while creating a database session: {e}")
+                    raise
+        finally:
+            replica.in_flight -= 1
+
     @asynccontextmanager
     async def transaction(self, session: AsyncSession) -> AsyncGenerator[None, None]:
         """
@@ -39,52 +201,131 @@ class DatabaseSessionManager:
         """
         try:
             yield
+            await run_before_commit(session)
             await session.commit()
         except Exception as e:
             await session.rollback()
+            session.info.pop('before_commit', None)
+            session.info.pop('after_commit', None)
             logger.exception(f"Transaction error: {e}")
             raise
+        run_after_commit(session)
+
+    @asynccontextmanager
+    async def request_session(self, request: Request) -> AsyncGenerator[AsyncSession, None]:
+        """
+        The single session of an HTTP request, shared by every dependency that asks for one,
+        so a request checks out at most one pooled connection. Safe methods (GET, HEAD, OPTIONS)
+        get a read-only session, on a replica when possible; other methods get a primary session.
+        The dependency that opened the session closes it, after all the others have finished.
+        """
+        shared = getattr(request.state, 'db_session', None)
+        if shared is not None:
+            yield shared
+            return
 
-    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
+        if request.method in READ_METHODS:
+            context = self.create_read_session(sticky_key=self.client_key(request))
+        else:
+            context = self.create_session()
+        async with context as session:
+            request.state.db_session = session
+            try:
+                yield session
+            finally:
+                request.state.db_session = None
+
+    async def get_session(self, request: Request) -> AsyncGenerator[AsyncSession, None]:
         """
-        FastAPI dependency that returns a session without transaction management.
+        FastAPI dependency that returns the request session without transaction management.
         """
-        async with self.create_session() as session:
+        async with self.request_session(request) as session:
             yield session
 
-    async def get_transaction_session(self) -> AsyncGenerator[AsyncSession, None]:
+    async def get_transaction_session(self, request: Request) -> AsyncGenerator[AsyncSession, None]:
         """
-        FastAPI dependency that returns a session with transaction management.
+        FastAPI dependency that returns the request session with transaction management, always on the primary.
         """
-        async with self.create_session() as session:
-            async with self.transaction(session):
-                yield session
+        async with self.request_session(request) as session:
+            if session.info.get('read_only'):
+                # A safe-method request asked for a transaction: it needs its own primary session
+                async with self.create_session() as primary_session:
+                    async with self.transaction(primary_session):
+                        yield primary_session
+            else:
+                async with self.transaction(session):
+                    yield session
+        self.mark_write(self.client_key(request))
 
-    def connection(self, isolation_level: Optional[str] = None, commit: bool = True):
+    @staticmethod
+    def transaction_options(
+            dialect_name: str,
+            isolation_level: Optional[str] = None,
+            read_only: bool = False,
+            deferrable: bool = False,
+    ) -> dict:
+        """
+        Translates transaction settings into SQLAlchemy execution options for the given dialect.
+        They are applied when the connection begins its transaction, without an extra statement.
+
+        SQLite only knows SERIALIZABLE, READ UNCOMMITTED and AUTOCOMMIT; stricter levels map to
+        SERIALIZABLE (what SQLite always provides). Read-only and deferrable are PostgreSQL features
+        and are ignored elsewhere.
+        """
+        options = {}
+        if isolation_level:
+            level = isolation_level.upper().replace('_', ' ')
+            if dialect_name == 'sqlite' and level not in ('READ UNCOMMITTED', 'AUTOCOMMIT'):
+                level = 'SERIALIZABLE'
+            options['isolation_level'] = level
+        if dialect_name == 'postgresql':
+            if read_only:
+                options['postgresql_readonly'] = True
+            if deferrable:
+                options['postgresql_deferrable'] = True
+        return options
+
+    def connection(
+            self,
+            isolation_level: Optional[str] = None,
+            commit: bool = True,
+            read_only: bool = False,
+            deferrable: bool = False,
+    ):
         """
         Decorator for managing a session with optional configuration for isolation level and commit.
 
         Parameters:
         - `isolation_level`: the isolation level for the transaction (e.g., "SERIALIZABLE").
         - `commit`: if `True`, the method performs a commit after execution.
+        - `read_only`: read-only transaction (PostgreSQL); the session never flushes or commits.
+        - `deferrable`: deferrable transaction (PostgreSQL, together with SERIALIZABLE and read-only).
         """
 
         def decorator(method):
             @wraps(method)
             async def wrapper(*args, **kwargs):
-                async with self.session_maker() as session:
+                session_kwargs = {'autoflush': False} if read_only else {}
+                async with self.session_maker(**session_kwargs) as session:
                     try:
-                        if isolation_level:
-                            await session.execute(text(f"SET TRANSACTION ISOLATION LEVEL {isolation_level}"))
+                        options = self.transaction_options(
+                            session.bind.dialect.name, isolation_level, read_only, deferrable,
+                        )
+                        if options:
+                            await session.connection(execution_options=options)
 
                         result = await method(*args, session=session, **kwargs)
 
-                        if commit:
+                        if commit and not read_only:
+                            await run_before_commit(session)
                             await session.commit()
+                            run_after_commit(session)
 
                         return result
                     except Exception as e:
                         await session.rollback()
+                        session.info.pop('before_commit', None)
+                        session.info.pop('after_commit', None)
                         logger.error(f"Error during transaction execution: {e}")
                         raise
                     finally:
@@ -106,7 +347,12 @@ class DatabaseSessionManager:
 
 
 # Initialize the database session manager
-session_manager = DatabaseSessionManager(async_session_maker)
+session_manager = DatabaseSessionManager(
+    async_session_maker,
+    replica_session_makers=replica_session_makers,
+    replica_selection=settings.DB_REPLICA_SELECTION,
+    sticky_seconds=settings.DB_READ_YOUR_WRITES_SECONDS,
+)
 
 # FastAPI dependencies for using sessions
 SessionDep = session_manager.session_dependency
@@ -118,6 +364,12 @@ TransactionSessionDep = session_manager.transaction_session_dependency
 #     # Method logic
 #     pass
 
+# Example usage of the decorator for a consistent read-only report (PostgreSQL: SERIALIZABLE READ ONLY DEFERRABLE)
+# @session_manager.connection(isolation_level="SERIALIZABLE", read_only=True, deferrable=True)
+# async def example_report(*args, session: AsyncSession, **kwargs):
+#     # Method logic
+#     pass
+
 
 # Example usage of a dependency
 # @router.post("/register/")
@@ -34,3 +34,18 @@ ForbiddenException = HTTPException(
     status_code=status.HTTP_403_FORBIDDEN,
     detail='Insufficient permissions',
 )
+
+InvalidPaginationCursorException = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail='Invalid pagination cursor',
+)
+
+InvalidIfMatchException = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail='Invalid If-Match header: expected a single entity tag, e.g. "3"',
+)
+
+BlogVersionMismatchException = HTTPException(
+    status_code=status.HTTP_412_PRECONDITION_FAILED,
+    detail='Blog was modified by another request',
+)
@@ -0,0 +1,95 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator
+
+from fastapi import FastAPI
+from loguru import logger
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.api.archive import run_archival
+from app.api.changes import change_feed
+from app.api.dao import BlogDAO, TagDAO
+from app.api.related import related_posts
+from app.api.trending import trending
+from app.api.views import view_counter
+from app.cache.invalidation import invalidation, BLOG_CHANGED, BLOG_REMOVED
+from app.cache.page_cache import invalidate_blog_pages
+from app.config import settings
+from app.dao.database import dispose_engines, prefill_pool
+from app.dao.session_maker import session_manager
+from app.pages.assets import asset_manifest
+from app.pages.templating import precompile_templates
+
+
+async def warm_caches() -> None:
+    """
+    Runs the hot read queries once (tags, first page of posts), so SQLAlchemy's compiled
+    statement cache and the database page cache are primed before real traffic arrives.
+    """
+    try:
+        async with session_manager.create_session() as session:
+            tags = await TagDAO.find_all(session=session, filters=None)
+            blogs = await BlogDAO.get_blog_list(session=session, author_id=None, tag=None)
+        logger.info(f"Caches warmed: {len(tags)} tags, {len(blogs['blogs'])} top posts")
+    except SQLAlchemyError as e:
+        logger.warning(f"Cache warm-up skipped: {e}")
+
+
+def subscribe_caches() -> None:
+    # Every in-process cache that holds blog data, applied in this worker and in every other one
+    invalidation.subscribe(BLOG_CHANGED, lambda key: invalidate_blog_pages(int(key)))
+    invalidation.subscribe(BLOG_CHANGED, lambda key: related_posts.schedule_reload(int(key)))
+    invalidation.subscribe(BLOG_REMOVED, lambda key: invalidate_blog_pages(int(key)))
+    invalidation.subscribe(BLOG_REMOVED, lambda key: trending.discard(int(key)))
+    invalidation.subscribe(BLOG_REMOVED, lambda key: related_posts.remove_blog(int(key)))
+    # Wakes long-polling GET /api/changes requests
+    invalidation.subscribe(BLOG_CHANGED, lambda key: change_feed.notify())
+    invalidation.subscribe(BLOG_REMOVED, lambda key: change_feed.notify())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Startup: open pool connections, fingerprint assets, compile templates and warm caches
+    try:
+        opened = await prefill_pool(settings.DB_POOL_PREFILL)
+        if opened:
+            logger.info(f"Connection pool pre-filled with {opened} connections")
+    except SQLAlchemyError as e:
+        logger.warning(f"Connection pool pre-fill failed: {e}")
+    asset_manifest.build()
+    precompile_templates()
+    await warm_caches()
+    subscribe_caches()
+    await trending.load()
+    try:
+        await related_posts.rebuild()
+    except SQLAlchemyError as e:
+        logger.warning(f"Related posts index not built: {e}")
+    background_tasks = [
+        asyncio.create_task(view_counter.run(settings.VIEW_COUNTS_FLUSH_INTERVAL)),
+        asyncio.create_task(trending.run(settings.TRENDING_REFRESH_INTERVAL)),
+        asyncio.create_task(related_posts.run(settings.RELATED_POSTS_REBUILD_INTERVAL)),
+        asyncio.create_task(run_archival(settings.ARCHIVE_INTERVAL)),
+    ]
+    if settings.INVALIDATION_POLL_INTERVAL > 0:
+        try:
+            await invalidation.start()
+            background_tasks.append(asyncio.create_task(invalidation.run()))
+        except SQLAlchemyError as e:
+            logger.warning(f"Cross-worker cache invalidation disabled: {e}")
+    if session_manager.replicas:
+        await session_manager.check_replicas()
+        background_tasks.append(asyncio.create_task(
+            session_manager.run_health_checks(settings.DB_REPLICA_HEALTH_CHECK_INTERVAL)
+        ))
+
+    yield
+
+    # Shutdown: stop background tasks, write back buffered views and close every pooled connection
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await view_counter.flush()
+    await dispose_engines()
+    logger.info("Database engines disposed")
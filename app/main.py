@@ -2,10 +2,26 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.auth.router import router as router_auth
 from app.api.router import router as router_api
+from app.api.views import ViewCountMiddleware, view_counter
 from app.pages.router import router as router_pages
-from fastapi.staticfiles import StaticFiles
+from app.cache.page_cache import PageCacheMiddleware, page_cache
+from app.config import settings
+from app.lifespan import lifespan
+from app.ratelimit.middleware import AdmissionControlMiddleware, RateLimitMiddleware
+from app.pages.assets import FingerprintedStaticFiles, STATIC_DIR, asset_manifest
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+
+# Middleware added later wraps the earlier one:
+# CORS -> rate limits -> view counts -> page cache -> admission control -> routes.
+# Cached pages skip admission control but are counted, CORS headers are computed per request and never cached.
+if settings.MAX_CONCURRENT_REQUESTS > 0:
+    app.add_middleware(AdmissionControlMiddleware, max_concurrent=settings.MAX_CONCURRENT_REQUESTS)
+if settings.PAGE_CACHE_ENABLED:
+    app.add_middleware(PageCacheMiddleware, cache=page_cache)
+app.add_middleware(ViewCountMiddleware, counter=view_counter)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -15,7 +31,7 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
-app.mount('/static', StaticFiles(directory='app/static'), name='static')
+app.mount('/static', FingerprintedStaticFiles(directory=STATIC_DIR, manifest=asset_manifest), name='static')
 
 
 @app.get("/")
@@ -12,7 +12,8 @@ from alembic import context
 from app.config import database_url
 from app.dao.database import Base
 from app.auth.models import Role, User
-from app.api.models import Blog, Tag, BlogTag
+from app.api.models import Blog, Tag, BlogTag, TrendingBlog, BlogArchive, BlogTagArchive, BlogChange, ScheduledJob
+from app.cache.models import CacheInvalidation
 
 config = context.config
 config.set_main_option("sqlalchemy.url", database_url)
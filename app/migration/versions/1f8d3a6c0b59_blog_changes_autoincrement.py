@@ -0,0 +1,32 @@
+"""blog_changes: AUTOINCREMENT ids
+
+Revision ID: 1f8d3a6c0b59
+Revises: 5c2b8e9d1f04
+Create Date: 2026-10-19 21:02:37.518364
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1f8d3a6c0b59'
+down_revision: Union[str, None] = '5c2b8e9d1f04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # PostgreSQL sequences never go back; on SQLite AUTOINCREMENT can only be set by rebuilding the table
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    with op.batch_alter_table('blog_changes', recreate='always', table_kwargs={'sqlite_autoincrement': True}):
+        pass
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    with op.batch_alter_table('blog_changes', recreate='always'):
+        pass
@@ -0,0 +1,29 @@
+"""add blogs.views
+
+Revision ID: 3f9c2a7d41b6
+Revises: b021700b127a
+Create Date: 2026-10-19 08:05:12.418203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d41b6'
+down_revision: Union[str, None] = 'b021700b127a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('blogs', sa.Column('views', sa.Integer(), server_default='0', nullable=False))
+    op.create_index('ix_blogs_views', 'blogs', ['views'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_blogs_views', table_name='blogs')
+    with op.batch_alter_table('blogs') as batch_op:
+        batch_op.drop_column('views')
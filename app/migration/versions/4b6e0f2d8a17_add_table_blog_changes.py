@@ -0,0 +1,37 @@
+"""add table blog_changes
+
+Revision ID: 4b6e0f2d8a17
+Revises: 7a3d5c1e9b42
+Create Date: 2026-10-19 16:21:08.264913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b6e0f2d8a17'
+down_revision: Union[str, None] = '7a3d5c1e9b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('blog_changes',
+    sa.Column('blog_id', sa.Integer(), nullable=False),
+    sa.Column('operation', sa.String(length=20), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('fields', sa.Text(), nullable=True),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_blog_changes_blog_id', 'blog_changes', ['blog_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_blog_changes_blog_id', table_name='blog_changes')
+    op.drop_table('blog_changes')
@@ -0,0 +1,32 @@
+"""cacheinvalidations: AUTOINCREMENT ids
+
+Revision ID: 5c2b8e9d1f04
+Revises: d83a6f0c5e21
+Create Date: 2026-10-19 20:41:16.904257
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2b8e9d1f04'
+down_revision: Union[str, None] = 'd83a6f0c5e21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # PostgreSQL sequences never go back; on SQLite AUTOINCREMENT can only be set by rebuilding the table
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    with op.batch_alter_table('cacheinvalidations', recreate='always', table_kwargs={'sqlite_autoincrement': True}):
+        pass
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    with op.batch_alter_table('cacheinvalidations', recreate='always'):
+        pass
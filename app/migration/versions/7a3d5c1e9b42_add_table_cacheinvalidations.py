@@ -0,0 +1,34 @@
+"""add table cacheinvalidations
+
+Revision ID: 7a3d5c1e9b42
+Revises: e2b7d93f5a18
+Create Date: 2026-10-19 14:03:27.540118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a3d5c1e9b42'
+down_revision: Union[str, None] = 'e2b7d93f5a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('cacheinvalidations',
+    sa.Column('topic', sa.String(length=50), nullable=False),
+    sa.Column('key', sa.String(length=100), nullable=False),
+    sa.Column('origin', sa.String(length=32), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('cacheinvalidations')
@@ -0,0 +1,55 @@
+"""blogs: AUTOINCREMENT ids, title unique among live blogs only
+
+Revision ID: 9e1f4c7b2d63
+Revises: 4b6e0f2d8a17
+Create Date: 2026-10-19 18:47:32.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e1f4c7b2d63'
+down_revision: Union[str, None] = '4b6e0f2d8a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Names the unnamed UNIQUE(title) of SQLite tables during batch operations, so it can be dropped
+naming_convention = {'uq': 'uq_%(table_name)s_%(column_0_name)s'}
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        # AUTOINCREMENT can only be set when a SQLite table is created: the table is rebuilt
+        with op.batch_alter_table(
+                'blogs',
+                recreate='always',
+                naming_convention=naming_convention,
+                table_kwargs={'sqlite_autoincrement': True},
+        ) as batch_op:
+            batch_op.drop_constraint('uq_blogs_title', type_='unique')
+        # Ids already moved to the archive must not be handed out again either
+        op.execute("DELETE FROM sqlite_sequence WHERE name = 'blogs'")
+        op.execute(
+            "INSERT INTO sqlite_sequence (name, seq) SELECT 'blogs', "
+            "max(coalesce((SELECT max(id) FROM blogs), 0), coalesce((SELECT max(id) FROM blogs_archive), 0))"
+        )
+    else:
+        op.drop_constraint('blogs_title_key', 'blogs', type_='unique')
+    op.create_index(
+        'uq_blogs_title', 'blogs', ['title'], unique=True,
+        sqlite_where=sa.text('deleted_at IS NULL'),
+        postgresql_where=sa.text('deleted_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_blogs_title', table_name='blogs')
+    if op.get_bind().dialect.name == 'sqlite':
+        with op.batch_alter_table('blogs', recreate='always') as batch_op:
+            batch_op.create_unique_constraint('uq_blogs_title', ['title'])
+    else:
+        op.create_unique_constraint('blogs_title_key', 'blogs', ['title'])
@@ -0,0 +1,27 @@
+"""add blogs.version
+
+Revision ID: c5e8f1a9d370
+Revises: 8d41e6b0c2f3
+Create Date: 2026-10-19 08:47:02.331950
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e8f1a9d370'
+down_revision: Union[str, None] = '8d41e6b0c2f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('blogs', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('blogs') as batch_op:
+        batch_op.drop_column('version')
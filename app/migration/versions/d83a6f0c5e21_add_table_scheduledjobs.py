@@ -0,0 +1,34 @@
+"""add table scheduledjobs
+
+Revision ID: d83a6f0c5e21
+Revises: 9e1f4c7b2d63
+Create Date: 2026-10-19 20:05:51.372940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd83a6f0c5e21'
+down_revision: Union[str, None] = '9e1f4c7b2d63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('scheduledjobs',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('last_run_at', sa.TIMESTAMP(), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('scheduledjobs')
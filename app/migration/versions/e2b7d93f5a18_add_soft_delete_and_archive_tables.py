@@ -0,0 +1,57 @@
+"""add blogs.deleted_at and archive tables
+
+Revision ID: e2b7d93f5a18
+Revises: c5e8f1a9d370
+Create Date: 2026-10-19 09:12:45.871306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b7d93f5a18'
+down_revision: Union[str, None] = 'c5e8f1a9d370'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('blogs', sa.Column('deleted_at', sa.TIMESTAMP(), nullable=True))
+    op.create_index('ix_blogs_deleted_at', 'blogs', ['deleted_at'])
+    op.create_table('blogs_archive',
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('author', sa.Integer(), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('short_description', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(), server_default='published', nullable=False),
+    sa.Column('views', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+    sa.Column('deleted_at', sa.TIMESTAMP(), nullable=True),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_blogs_archive_author', 'blogs_archive', ['author'])
+    op.create_table('blogtags_archive',
+    sa.Column('blog_id', sa.Integer(), nullable=False),
+    sa.Column('tag_id', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_blogtags_archive_blog_id', 'blogtags_archive', ['blog_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_blogtags_archive_blog_id', table_name='blogtags_archive')
+    op.drop_table('blogtags_archive')
+    op.drop_index('ix_blogs_archive_author', table_name='blogs_archive')
+    op.drop_table('blogs_archive')
+    op.drop_index('ix_blogs_deleted_at', table_name='blogs')
+    with op.batch_alter_table('blogs') as batch_op:
+        batch_op.drop_column('deleted_at')
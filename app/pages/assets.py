@@ -0,0 +1,121 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+from dataclasses import dataclass
+
+from loguru import logger
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # Brotli variants are optional, gzip is always available
+    brotli = None
+
+STATIC_DIR = os.path.join(settings.BASE_DIR, 'app', 'static')
+STATIC_URL_PREFIX = '/static/'
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# Only text assets are worth compressing
+COMPRESSIBLE_EXTENSIONS = frozenset({'.css', '.js', '.svg', '.html', '.json', '.txt', '.map'})
+
+
+@dataclass
+class Asset:
+    content: bytes
+    media_type: str
+    etag: str
+    gzip: bytes | None = None
+    br: bytes | None = None
+
+
+class AssetManifest:
+    """
+    Content-hashed names for the files in the static directory, e.g. "style/post.css" ->
+    "style/post.3f2a9c1b7d4e.css", with their content and compressed variants kept in memory.
+    Built once at startup, no build step needed.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.urls: dict[str, str] = {}
+        self.assets: dict[str, Asset] = {}
+
+    def build(self) -> None:
+        urls, assets = {}, {}
+        for root, _, files in os.walk(self.directory):
+            for filename in files:
+                base, extension = os.path.splitext(filename)
+                # Files without extension (.gitkeep) and stored variants are not served as assets
+                if not base or extension in ('.gz', '.br'):
+                    continue
+                full_path = os.path.join(root, filename)
+                path = os.path.relpath(full_path, self.directory).replace(os.sep, '/')
+                with open(full_path, 'rb') as f:
+                    content = f.read()
+
+                digest = hashlib.sha256(content).hexdigest()[:12]
+                fingerprinted = f"{path[:-len(filename)]}{base}.{digest}{extension}"
+                asset = Asset(
+                    content=content,
+                    media_type=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+                    etag=f'"{digest}"',
+                )
+                if extension in COMPRESSIBLE_EXTENSIONS:
+                    asset.gzip = self._variant(full_path, '.gz') or gzip.compress(content, compresslevel=9, mtime=0)
+                    asset.br = self._variant(full_path, '.br') or (brotli.compress(content) if brotli else None)
+                urls[path] = fingerprinted
+                assets[fingerprinted] = asset
+
+        self.urls, self.assets = urls, assets
+        logger.info(f"Asset manifest built: {len(assets)} assets")
+
+    @staticmethod
+    def _variant(full_path: str, suffix: str) -> bytes | None:
+        # A pre-compressed file shipped next to the asset takes precedence over compressing at startup
+        variant_path = full_path + suffix
+        if not os.path.isfile(variant_path):
+            return None
+        with open(variant_path, 'rb') as f:
+            return f.read()
+
+    def url(self, path: str) -> str:
+        """URL of a static file; falls back to the plain path for files outside the manifest."""
+        path = path.lstrip('/')
+        return STATIC_URL_PREFIX + self.urls.get(path, path)
+
+
+class FingerprintedStaticFiles(StaticFiles):
+    """
+    Serves fingerprinted names from the manifest with long-lived immutable caching and the best
+    compressed variant the client accepts. Plain names are served by StaticFiles as before.
+    """
+
+    def __init__(self, *, manifest: AssetManifest, **kwargs):
+        super().__init__(**kwargs)
+        self.manifest = manifest
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        asset = self.manifest.assets.get(path.replace(os.sep, '/'))
+        if asset is None or scope['method'] not in ('GET', 'HEAD'):
+            return await super().get_response(path, scope)
+
+        request_headers = Headers(scope=scope)
+        headers = {'Cache-Control': IMMUTABLE_CACHE_CONTROL, 'ETag': asset.etag, 'Vary': 'Accept-Encoding'}
+        if request_headers.get('if-none-match') == asset.etag:
+            return Response(status_code=304, headers=headers)
+
+        accepted = {encoding.split(';')[0].strip() for encoding in request_headers.get('accept-encoding', '').split(',')}
+        body = asset.content
+        if asset.br is not None and 'br' in accepted:
+            body, headers['Content-Encoding'] = asset.br, 'br'
+        elif asset.gzip is not None and 'gzip' in accepted:
+            body, headers['Content-Encoding'] = asset.gzip, 'gzip'
+        return Response(body, media_type=asset.media_type, headers=headers)
+
+
+asset_manifest = AssetManifest(STATIC_DIR)
@@ -1,20 +1,25 @@
 from fastapi import APIRouter, Depends, Request
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dao import BlogDAO
 from app.api.schemas import BlogFullResponse, BlogNotFound
 from app.api.dependencies import get_blog_info
+from app.api.related import related_posts
+from app.api.trending import trending
 from app.api.utils import convert_blog_model
 from app.auth.dependencies import get_current_user_optional
-import markdown2
-
 from app.auth.models import User
 from app.dao.session_maker import SessionDep
+from app.pages.templating import render_template, stream_template
 
 router = APIRouter(tags=['Frontend'])
 
-templates = Jinja2Templates(directory='app/templates')
+
+def render_markdown(text: str) -> str:
+    # markdown2 is imported on first render, it is only needed by the post page
+    import markdown2
+
+    return markdown2.markdown(text, extras=['fenced-code-blocks', 'tables'])
 
 
 @router.get('/blogs/{blog_id}/')
@@ -25,15 +30,20 @@ async def get_blog_post(
         user_data: User | None = Depends(get_current_user_optional)
 ):
     if isinstance(blog_info, BlogNotFound):
-        return templates.TemplateResponse(
-            "404.html", {"request": request, "blog_id": blog_id}
+        return await render_template(
+            request, "404.html", {"blog_id": blog_id}, status_code=404
         )
     else:
         blog = blog_info.model_dump()
-        blog['content'] = markdown2.markdown(blog['content'], extras=['fenced-code-blocks', 'tables'])
-        return templates.TemplateResponse(
+        blog['content'] = render_markdown(blog['content'])
+        return await render_template(
+            request,
             "post.html",
-            {"request": request, "article": blog, "current_user_id": user_data.id if user_data else None}
+            {
+                "article": blog,
+                "current_user_id": user_data.id if user_data else None,
+                "related": related_posts.related(blog_id),
+            }
         )
 
 
@@ -53,14 +63,16 @@ async def get_blog_post(
         page=page,
         page_size=page_size
     )
-    return templates.TemplateResponse(
+    return stream_template(
+        request,
         "posts.html",
         {
-            "request": request,
             "article": blogs,
             "filters": {
                 "author_id": author_id,
                 "tag": tag,
-            }
+            },
+            # Only the unfiltered first page shows the trending section
+            "trending": trending.top(5) if page == 1 and author_id is None and tag is None else [],
         }
     )
\ No newline at end of file
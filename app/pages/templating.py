@@ -0,0 +1,47 @@
+import os
+
+from fastapi import Request
+from fastapi.responses import HTMLResponse, StreamingResponse
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from app.config import settings
+from app.pages.assets import asset_manifest
+
+TEMPLATES_DIR = os.path.join(settings.BASE_DIR, 'app', 'templates')
+PAGE_TEMPLATES = ('post.html', 'posts.html', '404.html')
+
+if settings.TEMPLATES_BYTECODE_CACHE_DIR:
+    os.makedirs(settings.TEMPLATES_BYTECODE_CACHE_DIR, exist_ok=True)
+
+# Async environment: templates can await async values and stream with generate_async; rendering
+# itself is still CPU work on the event loop. Compiled bytecode is reused across processes and restarts
+templates_env = Environment(
+    loader=FileSystemLoader(TEMPLATES_DIR),
+    autoescape=True,
+    enable_async=True,
+    auto_reload=settings.TEMPLATES_AUTO_RELOAD,
+    bytecode_cache=FileSystemBytecodeCache(settings.TEMPLATES_BYTECODE_CACHE_DIR),
+)
+templates_env.globals['static_url'] = asset_manifest.url
+
+
+def precompile_templates() -> None:
+    """Compiles page templates up front, so the first render doesn't pay the compile cost."""
+    for name in PAGE_TEMPLATES:
+        templates_env.get_template(name)
+
+
+async def render_template(request: Request, name: str, context: dict, status_code: int = 200) -> HTMLResponse:
+    template = templates_env.get_template(name)
+    html = await template.render_async({'request': request, **context})
+    return HTMLResponse(html, status_code=status_code)
+
+
+def stream_template(request: Request, name: str, context: dict, status_code: int = 200) -> StreamingResponse:
+    """Sends the page as it renders, for large list pages."""
+    template = templates_env.get_template(name)
+    return StreamingResponse(
+        template.generate_async({'request': request, **context}),
+        status_code=status_code,
+        media_type='text/html; charset=utf-8',
+    )
@@ -0,0 +1,127 @@
+import hashlib
+import math
+import re
+from dataclasses import dataclass
+
+from loguru import logger
+from starlette.requests import cookie_parser
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+from app.ratelimit.storage import TokenBucketStorage, InMemoryTokenBucketStorage
+
+AUTH_COOKIE = 'users_access_token'
+WRITE_METHODS = frozenset({'POST', 'PUT', 'PATCH', 'DELETE'})
+ALL_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', *WRITE_METHODS})
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """`rate` tokens per second refill a bucket of `burst` tokens, one bucket per client IP or per user."""
+    name: str
+    methods: frozenset[str]
+    path: re.Pattern
+    rate: float
+    burst: int
+    per: str = 'ip'
+
+    def matches(self, method: str, path: str) -> bool:
+        return method in self.methods and self.path.match(path) is not None
+
+
+def default_rules() -> list[RateLimitRule]:
+    return [
+        # bcrypt makes every login attempt expensive, and it's the brute-force target
+        RateLimitRule('login', frozenset({'POST'}), re.compile(r'^/auth/login/$'),
+                      rate=settings.RATE_LIMIT_LOGIN_PER_MINUTE / 60, burst=settings.RATE_LIMIT_LOGIN_PER_MINUTE),
+        RateLimitRule('register', frozenset({'POST'}), re.compile(r'^/auth/register/$'),
+                      rate=settings.RATE_LIMIT_LOGIN_PER_MINUTE / 60, burst=settings.RATE_LIMIT_LOGIN_PER_MINUTE),
+        RateLimitRule('api_writes', WRITE_METHODS, re.compile(r'^/api/'),
+                      rate=settings.RATE_LIMIT_WRITES_PER_MINUTE / 60, burst=settings.RATE_LIMIT_WRITES_PER_MINUTE,
+                      per='user'),
+        RateLimitRule('per_ip', ALL_METHODS, re.compile(r'^/(?!static/)'),
+                      rate=settings.RATE_LIMIT_IP_PER_SECOND, burst=int(settings.RATE_LIMIT_IP_PER_SECOND * 2)),
+    ]
+
+
+def client_ip(scope: Scope) -> str:
+    client = scope.get('client')
+    return client[0] if client else 'unknown'
+
+
+def client_user(scope: Scope) -> str | None:
+    # The token identifies the user without decoding the JWT; only its hash is kept
+    cookie_header = Headers(scope=scope).get('cookie')
+    token = cookie_parser(cookie_header).get(AUTH_COOKIE) if cookie_header else None
+    return hashlib.sha256(token.encode()).hexdigest()[:32] if token else None
+
+
+class RateLimitMiddleware:
+    """Applies every matching rule; the first exhausted bucket rejects the request with 429."""
+
+    def __init__(self, app: ASGIApp, storage: TokenBucketStorage | None = None,
+                 rules: list[RateLimitRule] | None = None):
+        self.app = app
+        self.storage = storage or InMemoryTokenBucketStorage()
+        self.rules = default_rules() if rules is None else rules
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        method, path = scope['method'], scope['path']
+        for rule in self.rules:
+            if not rule.matches(method, path):
+                continue
+            subject = (client_user(scope) if rule.per == 'user' else None) or f"ip:{client_ip(scope)}"
+            allowed, retry_after = await self.storage.consume(f"{rule.name}:{subject}", rule.rate, rule.burst)
+            if not allowed:
+                logger.warning(f"Rate limit '{rule.name}' exceeded by {subject[:16]} on {method} {path}")
+                response = JSONResponse(
+                    status_code=429,
+                    content={'detail': 'Too many requests'},
+                    headers={'Retry-After': str(max(1, math.ceil(retry_after)))},
+                )
+                await response(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
+
+
+class AdmissionControlMiddleware:
+    """
+    Caps requests processed at once. Beyond `max_concurrent` requests are shed immediately with 503,
+    before they queue for a database connection and time out together.
+    """
+    # Static files need no connection; change feed long polls release theirs while waiting
+    EXEMPT_PREFIXES = ('/static/', '/api/changes')
+
+    def __init__(self, app: ASGIApp, max_concurrent: int):
+        self.app = app
+        self.max_concurrent = max_concurrent
+        self.in_flight = 0
+        self.shed = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or scope['path'].startswith(self.EXEMPT_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        if self.in_flight >= self.max_concurrent:
+            self.shed += 1
+            response = JSONResponse(
+                status_code=503,
+                content={'detail': 'Server is overloaded, try again later'},
+                headers={'Retry-After': '1'},
+            )
+            await response(scope, receive, send)
+            return
+
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
@@ -0,0 +1,71 @@
+import time
+from collections import OrderedDict
+from typing import Any, Protocol
+
+
+class TokenBucketStorage(Protocol):
+    """Keeps token buckets; `consume` takes `cost` tokens if available."""
+
+    async def consume(self, key: str, rate: float, capacity: float, cost: float = 1.0) -> tuple[bool, float]:
+        """Returns (allowed, seconds until `cost` tokens are available)."""
+        ...
+
+
+def refill(tokens: float, updated_at: float, now: float, rate: float, capacity: float) -> float:
+    return min(capacity, tokens + (now - updated_at) * rate)
+
+
+def take(tokens: float, rate: float, cost: float) -> tuple[bool, float, float]:
+    # (allowed, tokens left, retry after)
+    if tokens >= cost:
+        return True, tokens - cost, 0.0
+    return False, tokens, (cost - tokens) / rate if rate > 0 else float('inf')
+
+
+class InMemoryTokenBucketStorage:
+    """
+    Per-process buckets. At most `max_keys` buckets are kept; the least recently used are dropped,
+    which only makes a forgotten client start again with a full bucket.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def consume(self, key: str, rate: float, capacity: float, cost: float = 1.0) -> tuple[bool, float]:
+        now = time.monotonic()
+        bucket = self._buckets.pop(key, None)
+        tokens = capacity if bucket is None else refill(*bucket, now, rate, capacity)
+        allowed, tokens, retry_after = take(tokens, rate, cost)
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return allowed, retry_after
+
+
+class RedisTokenBucketStorage:
+    """
+    Buckets shared by all workers, stored as Redis hashes. `client` is a redis.asyncio.Redis or any
+    object with the same async `hmget`, `hset(key, mapping=...)` and `pexpire` methods (e.g. a fake).
+    Read and write are separate commands, so concurrent requests of one client may slightly overdraw
+    a bucket; that is acceptable for throttling.
+    """
+
+    def __init__(self, client: Any, prefix: str = 'ratelimit:'):
+        self.client = client
+        self.prefix = prefix
+
+    async def consume(self, key: str, rate: float, capacity: float, cost: float = 1.0) -> tuple[bool, float]:
+        redis_key = self.prefix + key
+        now = time.time()
+        stored_tokens, stored_at = await self.client.hmget(redis_key, ['tokens', 'updated_at'])
+        if stored_tokens is None or stored_at is None:
+            tokens = capacity
+        else:
+            tokens = refill(float(stored_tokens), float(stored_at), now, rate, capacity)
+        allowed, tokens, retry_after = take(tokens, rate, cost)
+        await self.client.hset(redis_key, mapping={'tokens': tokens, 'updated_at': now})
+        # An idle bucket refills completely in capacity / rate seconds, after that it can be forgotten
+        ttl_ms = int(capacity / rate * 1000) + 1000 if rate > 0 else 3_600_000
+        await self.client.pexpire(redis_key, ttl_ms)
+        return allowed, retry_after
@@ -0,0 +1,204 @@
+"""
+Shared helpers for the benchmark scripts: environment setup, database seeding and query counting.
+
+`configure_environment` must be called before anything from `app` is imported, because the
+engine is created from `Settings` at import time.
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DATA_DIR = os.path.join(ROOT_DIR, 'benchmarks', '.data')
+DEFAULT_DB_PATH = os.path.join(DATA_DIR, 'bench.sqlite3')
+BENCHMARK_PASSWORD = 'benchmark'
+ROLE_NAMES = ('User', 'Moderator', 'Admin', 'SuperAdmin')
+WORDS = (
+    'async', 'python', 'fastapi', 'database', 'index', 'query', 'latency', 'cache', 'session', 'pool',
+    'request', 'response', 'template', 'markdown', 'server', 'worker', 'deploy', 'profile', 'memory', 'thread',
+)
+
+
+class SeedVolumes(NamedTuple):
+    users: int
+    blogs: int
+    tags: int
+    tags_per_blog: int = 3
+
+
+def configure_environment(db_path: str = DEFAULT_DB_PATH) -> None:
+    """
+    Points the application at the benchmark SQLite file, or at BENCHMARK_DB_URL when it is set
+    (e.g. a local PostgreSQL database), and fills in required settings.
+    """
+    if os.environ.get('BENCHMARK_DB_URL'):
+        os.environ['DB_URL'] = os.environ['BENCHMARK_DB_URL']
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        os.environ['DB_URL'] = f'sqlite+aiosqlite:///{os.path.abspath(db_path)}'
+    os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key')
+    os.environ.setdefault('ALGORITHM', 'HS256')
+    # The load generator is a single client; throttling it would measure the limiter, not the app
+    os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')
+    os.environ.setdefault('MAX_CONCURRENT_REQUESTS', '0')
+
+
+def configure_logging(level: str) -> None:
+    """Replaces the default loguru sink, so per-query INFO logs don't flood the terminal."""
+    from loguru import logger
+
+    logger.remove()
+    logger.add(sys.stderr, level=level)
+
+
+def user_email(user_id: int) -> str:
+    return f'user{user_id}@benchmark.com'
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(count))
+
+
+def _blog_content(rng: random.Random) -> str:
+    # Roughly 2 KB of markdown with headers, a list and a code block
+    paragraphs = [f'## {_words(rng, 4).title()}\n\n{_words(rng, 60)}' for _ in range(3)]
+    paragraphs.append('\n'.join(f'- {_words(rng, 5)}' for _ in range(5)))
+    paragraphs.append(f'```python\nprint("{_words(rng, 3)}")\n```')
+    return '\n\n'.join(paragraphs)
+
+
+async def _count_rows(engine, table: str) -> int:
+    from sqlalchemy import text
+
+    async with engine.connect() as connection:
+        return (await connection.execute(text(f'SELECT count(*) FROM {table}'))).scalar_one()
+
+
+async def is_seeded(engine, volumes: SeedVolumes) -> bool:
+    from sqlalchemy.exc import DBAPIError
+
+    try:
+        return (
+                await _count_rows(engine, 'users') == volumes.users
+                and await _count_rows(engine, 'blogs') == volumes.blogs
+                and await _count_rows(engine, 'tags') == volumes.tags
+        )
+    except DBAPIError:
+        # No schema yet
+        return False
+
+
+async def seed_database(engine, volumes: SeedVolumes, seed: int = 42, chunk_size: int = 10_000) -> None:
+    """
+    Recreates the schema and fills it with deterministic data: `volumes.users` users sharing
+    BENCHMARK_PASSWORD, `volumes.tags` tags and `volumes.blogs` posts (90% published) spread
+    over the last two years, each with `volumes.tags_per_blog` tags.
+    """
+    from sqlalchemy import insert
+
+    from app.api.models import Blog, BlogTag, Tag
+    from app.auth.models import Role, User
+    from app.auth.utils import get_password_hash
+    from app.cache.models import CacheInvalidation  # noqa: F401 (registers the table on Base)
+    from app.dao.database import Base
+
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    password_hash = get_password_hash(BENCHMARK_PASSWORD)
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+
+        await connection.execute(insert(Role), [{'name': name} for name in ROLE_NAMES])
+
+        for start in range(1, volumes.users + 1, chunk_size):
+            await connection.execute(insert(User), [
+                {
+                    'id': user_id,
+                    'phone_number': f'+1{user_id:09d}',
+                    'first_name': f'First{user_id}',
+                    'last_name': f'Last{user_id}',
+                    'email': user_email(user_id),
+                    'password': password_hash,
+                    # Every hundredth user is an admin, so admin endpoints can be driven too
+                    'role_id': 3 if user_id % 100 == 0 else 1,
+                }
+                for user_id in range(start, min(start + chunk_size, volumes.users + 1))
+            ])
+
+        await connection.execute(insert(Tag), [
+            {'id': tag_id, 'name': f'tag{tag_id}'} for tag_id in range(1, volumes.tags + 1)
+        ])
+
+        tags_per_blog = min(volumes.tags_per_blog, volumes.tags)
+        for start in range(1, volumes.blogs + 1, chunk_size):
+            blog_ids = range(start, min(start + chunk_size, volumes.blogs + 1))
+            blogs, blog_tags = [], []
+            for blog_id in blog_ids:
+                created_at = now - timedelta(minutes=rng.randint(0, 2 * 365 * 24 * 60))
+                blogs.append({
+                    'id': blog_id,
+                    'title': f'Benchmark post {blog_id}: {_words(rng, 4)}',
+                    'author': rng.randint(1, volumes.users),
+                    'content': _blog_content(rng),
+                    'short_description': _words(rng, 25),
+                    'status': 'draft' if rng.random() < 0.1 else 'published',
+                    'created_at': created_at,
+                    'updated_at': created_at,
+                })
+                blog_tags.extend(
+                    {'blog_id': blog_id, 'tag_id': tag_id}
+                    for tag_id in rng.sample(range(1, volumes.tags + 1), tags_per_blog)
+                )
+            await connection.execute(insert(Blog), blogs)
+            if blog_tags:
+                await connection.execute(insert(BlogTag), blog_tags)
+
+        if connection.dialect.name == 'postgresql':
+            # Rows were inserted with explicit ids, move the sequences past them
+            from sqlalchemy import text
+
+            for table in ('roles', 'users', 'tags', 'blogs', 'blogtags'):
+                await connection.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), coalesce(max(id), 1)) FROM {table}"
+                ))
+
+    print(f'Seeded {volumes.users} users, {volumes.blogs} blogs, {volumes.tags} tags '
+          f'in {time.perf_counter() - started:.1f} s')
+
+
+async def ensure_seeded(engine, volumes: SeedVolumes, seed: int = 42) -> None:
+    """Seeds the database unless it already holds exactly the requested volumes."""
+    if await is_seeded(engine, volumes):
+        print(f'Reusing seeded database ({volumes.users} users, {volumes.blogs} blogs, {volumes.tags} tags)')
+        return
+    await seed_database(engine, volumes, seed=seed)
+
+
+class QueryCounter:
+    """Counts SQL statements sent to the database through the given engine."""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.count = 0
+        event.listen(engine.sync_engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, *args, **kwargs) -> None:
+        self.count += 1
+
+    def reset(self) -> int:
+        count, self.count = self.count, 0
+        return count
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
@@ -0,0 +1,236 @@
+"""
+Micro-benchmarks for BaseDAO primitives and the Pydantic conversions used by the endpoints.
+
+DAO calls are measured twice: with loguru logging to a null sink (formatting cost, no I/O) and
+with logging disabled, so the logging share of each call is visible. ORM hydration is isolated by
+loading the same rows as Core rows and as ORM entities. Write benchmarks roll back after every
+call, so the seeded data doesn't change between runs.
+
+Usage:
+    python -m benchmarks.dao --blogs 10000 --iterations 500
+    python -m benchmarks.dao --output bench_dao.json
+    python -m benchmarks.dao --compare bench_dao.json
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from typing import Awaitable, Callable, NamedTuple
+
+from benchmarks.common import DEFAULT_DB_PATH, SeedVolumes, configure_environment, ensure_seeded, percentile
+
+
+class BenchResult(NamedTuple):
+    name: str
+    iterations: int
+    mean_us: float
+    p50_us: float
+    p95_us: float
+
+
+def _summarize(name: str, timings: list[float]) -> BenchResult:
+    timings.sort()
+    return BenchResult(
+        name=name,
+        iterations=len(timings),
+        mean_us=statistics.fmean(timings) * 1e6,
+        p50_us=percentile(timings, 0.50) * 1e6,
+        p95_us=percentile(timings, 0.95) * 1e6,
+    )
+
+
+async def bench_async(name: str, fn: Callable[[], Awaitable], iterations: int) -> BenchResult:
+    for _ in range(min(10, iterations)):
+        await fn()
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await fn()
+        timings.append(time.perf_counter() - started)
+    return _summarize(name, timings)
+
+
+def bench_sync(name: str, fn: Callable[[], object], iterations: int) -> BenchResult:
+    for _ in range(min(10, iterations)):
+        fn()
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return _summarize(name, timings)
+
+
+async def dao_benchmarks(volumes: SeedVolumes, iterations: int, suffix: str) -> list[BenchResult]:
+    from pydantic import create_model
+
+    from app.api.dao import BlogDAO, TagDAO
+    from app.auth.dao import UsersDAO
+    from app.auth.schemas import EmailModel
+    from app.dao.database import async_session_maker
+    from benchmarks.common import user_email
+
+    AuthorFilter = create_model('AuthorFilter', author=(int, ...))
+    TagValues = create_model('TagValues', name=(str, ...))
+    BlogStatusValues = create_model('BlogStatusValues', id=(int, ...), status=(str, ...))
+
+    results = []
+    async with async_session_maker() as session:
+        async def find_one_or_none():
+            await UsersDAO.find_one_or_none(session=session, filters=EmailModel(email=user_email(volumes.users // 2)))
+
+        async def find_all():
+            await BlogDAO.find_all(session=session, filters=AuthorFilter(author=1))
+
+        # A cursor deep into the table: keyset pages cost the same regardless of depth
+        deep_cursor = BlogDAO.encode_cursor([volumes.blogs // 2])
+
+        async def paginate():
+            await BlogDAO.paginate(session=session, page_size=20, cursor=deep_cursor)
+
+        async def add_many():
+            await TagDAO.add_many(session=session, instances=[TagValues(name=f'bench-{i}') for i in range(20)])
+            await session.rollback()
+
+        async def bulk_update():
+            await BlogDAO.bulk_update(
+                session=session,
+                records=[BlogStatusValues(id=blog_id, status='draft') for blog_id in range(1, 21)],
+            )
+            await session.rollback()
+
+        async def upsert():
+            await TagDAO.upsert(session=session, unique_fields=['name'], values=TagValues(name='tag1'))
+            await session.rollback()
+
+        for name, fn in (
+                ('find_one_or_none', find_one_or_none),
+                ('find_all', find_all),
+                ('paginate', paginate),
+                ('add_many[20]', add_many),
+                ('bulk_update[20]', bulk_update),
+                ('upsert', upsert),
+        ):
+            results.append(await bench_async(f'{name} ({suffix})', fn, iterations))
+    return results
+
+
+async def hydration_benchmarks(iterations: int) -> list[BenchResult]:
+    from sqlalchemy import select
+    from sqlalchemy.orm import joinedload, selectinload
+
+    from app.api.models import Blog
+    from app.dao.database import async_session_maker
+
+    core_query = select(Blog.__table__).order_by(Blog.id).limit(100)
+    orm_query = select(Blog).order_by(Blog.id).limit(100)
+    full_query = orm_query.options(joinedload(Blog.user), selectinload(Blog.tags))
+
+    async with async_session_maker() as session:
+        async def core_rows():
+            (await session.execute(core_query)).all()
+
+        async def orm_entities():
+            (await session.execute(orm_query)).scalars().all()
+            session.expunge_all()
+
+        async def orm_with_relations():
+            (await session.execute(full_query)).unique().scalars().all()
+            session.expunge_all()
+
+        return [
+            await bench_async('100 blogs as Core rows', core_rows, iterations),
+            await bench_async('100 blogs as ORM entities', orm_entities, iterations),
+            await bench_async('100 blogs + user + tags', orm_with_relations, iterations),
+        ]
+
+
+async def pydantic_benchmarks(iterations: int) -> list[BenchResult]:
+    from sqlalchemy import select
+    from sqlalchemy.orm import joinedload, selectinload
+
+    from app.api.models import Blog
+    from app.api.utils import convert_blog_model
+    from app.auth.models import User
+    from app.auth.schemas import SUserInfo
+    from app.dao.database import async_session_maker
+
+    async with async_session_maker() as session:
+        blog = (await session.execute(
+            select(Blog).options(joinedload(Blog.user), selectinload(Blog.tags)).order_by(Blog.id).limit(1)
+        )).scalar_one()
+        user = (await session.execute(select(User).order_by(User.id).limit(1))).scalar_one()
+
+    response = convert_blog_model(blog)
+    return [
+        bench_sync('convert_blog_model', lambda: convert_blog_model(blog), iterations * 10),
+        bench_sync('BlogFullResponse.model_dump', lambda: response.model_dump(), iterations * 10),
+        bench_sync('BlogFullResponse.model_dump_json', lambda: response.model_dump_json(), iterations * 10),
+        bench_sync('SUserInfo.model_validate', lambda: SUserInfo.model_validate(user), iterations * 10),
+    ]
+
+
+def print_results(results: list[BenchResult], reference: dict | None) -> None:
+    header = f'{"benchmark":<40}{"iters":>8}{"mean us":>12}{"p50 us":>12}{"p95 us":>12}'
+    if reference:
+        header += f'{"vs ref":>10}'
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        line = f'{r.name:<40}{r.iterations:>8}{r.mean_us:>12.1f}{r.p50_us:>12.1f}{r.p95_us:>12.1f}'
+        if reference and r.name in reference:
+            line += f'{(r.p50_us / reference[r.name]["p50_us"] - 1):>+10.1%}'
+        print(line)
+
+
+async def run(args: argparse.Namespace) -> int:
+    from loguru import logger
+
+    from app.dao.database import engine
+
+    volumes = SeedVolumes(users=args.users, blogs=args.blogs, tags=args.tags)
+    await ensure_seeded(engine, volumes)
+
+    results = []
+    # Logging on: loguru formats every message but writes to a null sink, so only the CPU cost is measured
+    logger.remove()
+    logger.add(lambda message: None, level='INFO')
+    results += await dao_benchmarks(volumes, args.iterations, 'logging on')
+    logger.disable('app')
+    results += await dao_benchmarks(volumes, args.iterations, 'logging off')
+    results += await hydration_benchmarks(args.iterations)
+    results += await pydantic_benchmarks(args.iterations)
+    await engine.dispose()
+
+    reference = None
+    if args.compare:
+        with open(args.compare) as f:
+            reference = json.load(f)
+    print_results(results, reference)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({r.name: r._asdict() for r in results}, f, indent=2)
+        print(f'Results saved to {args.output}')
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help='SQLite file used for the benchmark')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--blogs', type=int, default=10_000)
+    parser.add_argument('--tags', type=int, default=200)
+    parser.add_argument('--iterations', type=int, default=500, help='Measured calls per DAO benchmark')
+    parser.add_argument('--output', help='Write results to this JSON file')
+    parser.add_argument('--compare', help='Show p50 change against a previous --output file')
+    args = parser.parse_args()
+
+    configure_environment(args.db)
+    return asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+Load benchmark for the public endpoints, driven in-process through an ASGI client.
+
+Seeds a local SQLite database (reused between runs while the volumes don't change), then runs
+every scenario with `--concurrency` concurrent clients and reports p50/p95/p99 latency,
+throughput and SQL queries per request. `--save-baseline` stores the results, later runs are
+compared against that file and exit with status 1 on a regression.
+
+Usage:
+    python -m benchmarks.endpoints --blogs 10000 --concurrency 16 --requests 500
+    python -m benchmarks.endpoints --blogs 1000000 --users 50000 --save-baseline
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from typing import Awaitable, Callable, NamedTuple
+
+from benchmarks.common import (
+    DEFAULT_DB_PATH, BENCHMARK_PASSWORD, ROOT_DIR, SeedVolumes, QueryCounter, configure_environment,
+    configure_logging, ensure_seeded, percentile, user_email,
+)
+
+DEFAULT_BASELINE_PATH = os.path.join(ROOT_DIR, 'benchmarks', 'baseline.json')
+
+
+class ScenarioResult(NamedTuple):
+    name: str
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    throughput_rps: float
+    queries_per_request: float
+
+
+def build_scenarios(volumes: SeedVolumes, rng: random.Random, token: str) -> dict[str, Callable]:
+    """Maps scenario names to callables issuing one request with a given client."""
+    list_pages = max(1, min(100, volumes.blogs // 10))
+    cookies = {'users_access_token': token}
+
+    def random_blog_id() -> int:
+        return rng.randint(1, volumes.blogs)
+
+    def login_payload() -> dict:
+        return {'email': user_email(rng.randint(1, volumes.users)), 'password': BENCHMARK_PASSWORD}
+
+    return {
+        'api_blog_list': lambda client: client.get('/api/blogs/', params={'page': rng.randint(1, list_pages)}),
+        'api_blog_detail': lambda client: client.get(f'/api/blogs/{random_blog_id()}'),
+        'page_blog_list': lambda client: client.get('/blogs/', params={'page': rng.randint(1, list_pages)}),
+        'page_blog_detail': lambda client: client.get(f'/blogs/{random_blog_id()}/'),
+        'auth_login': lambda client: client.post('/auth/login/', json=login_payload()),
+        'auth_me': lambda client: client.get('/auth/me/', cookies=cookies),
+    }
+
+
+async def run_scenario(
+        name: str,
+        issue: Callable[..., Awaitable],
+        client,
+        counter: QueryCounter,
+        total_requests: int,
+        concurrency: int,
+) -> ScenarioResult:
+    latencies: list[float] = []
+    errors = 0
+    remaining = total_requests
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            response = await issue(client)
+            latencies.append(time.perf_counter() - started)
+            # Seeded drafts (10%) are answered with the 404 page, which is expected
+            if response.status_code >= 400 and response.status_code != 404:
+                errors += 1
+
+    counter.reset()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    queries = counter.reset()
+
+    latencies.sort()
+    return ScenarioResult(
+        name=name,
+        requests=len(latencies),
+        errors=errors,
+        p50_ms=percentile(latencies, 0.50) * 1000,
+        p95_ms=percentile(latencies, 0.95) * 1000,
+        p99_ms=percentile(latencies, 0.99) * 1000,
+        throughput_rps=len(latencies) / elapsed if elapsed else 0.0,
+        queries_per_request=queries / len(latencies) if latencies else 0.0,
+    )
+
+
+def print_results(results: list[ScenarioResult]) -> None:
+    header = f'{"scenario":<18}{"reqs":>7}{"errors":>8}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}{"req/s":>10}{"q/req":>8}'
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f'{r.name:<18}{r.requests:>7}{r.errors:>8}{r.p50_ms:>10.2f}{r.p95_ms:>10.2f}{r.p99_ms:>10.2f}'
+              f'{r.throughput_rps:>10.1f}{r.queries_per_request:>8.2f}')
+
+
+def compare_with_baseline(results: list[ScenarioResult], baseline: dict, tolerance: float) -> list[str]:
+    """Returns human-readable regressions: slower p95, lower throughput or more queries per request."""
+    regressions = []
+    for result in results:
+        reference = baseline.get(result.name)
+        if not reference:
+            continue
+        if result.p95_ms > reference['p95_ms'] * (1 + tolerance):
+            regressions.append(f'{result.name}: p95 {result.p95_ms:.2f} ms > baseline {reference["p95_ms"]:.2f} ms')
+        if result.throughput_rps < reference['throughput_rps'] * (1 - tolerance):
+            regressions.append(
+                f'{result.name}: throughput {result.throughput_rps:.1f} req/s '
+                f'< baseline {reference["throughput_rps"]:.1f} req/s'
+            )
+        if result.queries_per_request > reference['queries_per_request'] + 1e-9:
+            regressions.append(
+                f'{result.name}: {result.queries_per_request:.2f} queries/request '
+                f'> baseline {reference["queries_per_request"]:.2f}'
+            )
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> int:
+    import httpx
+
+    from app.dao.database import engine
+    from app.main import app
+
+    volumes = SeedVolumes(users=args.users, blogs=args.blogs, tags=args.tags, tags_per_blog=args.tags_per_blog)
+    await ensure_seeded(engine, volumes, seed=args.seed)
+
+    rng = random.Random(args.seed)
+    counter = QueryCounter(engine)
+    results = []
+    transport = httpx.ASGITransport(app=app)
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url='http://benchmark') as client:
+            login = await client.post('/auth/login/', json={'email': user_email(1), 'password': BENCHMARK_PASSWORD})
+            login.raise_for_status()
+            client.cookies.clear()
+            scenarios = build_scenarios(volumes, rng, login.json()['access_token'])
+
+            selected = args.scenario or list(scenarios)
+            for name in selected:
+                issue = scenarios[name]
+                # Warm-up requests are not measured
+                for _ in range(min(args.warmup, args.requests)):
+                    await issue(client)
+                # Login hashes with bcrypt on purpose, so it gets a smaller request budget
+                total = max(1, args.requests // 10) if name == 'auth_login' else args.requests
+                results.append(await run_scenario(name, issue, client, counter, total, args.concurrency))
+
+    print_results(results)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({r.name: r._asdict() for r in results}, f, indent=2)
+        print(f'Baseline saved to {args.baseline}')
+        return 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare_with_baseline(results, json.load(f), args.tolerance)
+        if regressions:
+            print('Regressions against baseline:')
+            for regression in regressions:
+                print(f'  {regression}')
+            return 1
+        print(f'No regressions against {args.baseline} (tolerance {args.tolerance:.0%})')
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help='SQLite file used for the benchmark')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--blogs', type=int, default=10_000)
+    parser.add_argument('--tags', type=int, default=200)
+    parser.add_argument('--tags-per-blog', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for data and request mix')
+    parser.add_argument('--concurrency', type=int, default=16, help='Concurrent in-process clients')
+    parser.add_argument('--requests', type=int, default=500, help='Measured requests per scenario')
+    parser.add_argument('--warmup', type=int, default=20, help='Unmeasured requests per scenario')
+    parser.add_argument('--scenario', action='append', help='Run only the given scenario (repeatable)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH, help='Baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true', help='Store results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed relative regression')
+    parser.add_argument('--log-level', default='WARNING', help='Application log level during the run')
+    args = parser.parse_args()
+
+    configure_environment(args.db)
+    configure_logging(args.log_level)
+    return asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
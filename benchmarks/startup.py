@@ -0,0 +1,91 @@
+"""
+Startup budget check: measures how long `import app.main` takes with `python -X importtime`
+and fails when it exceeds the budget or when a deferred module is imported eagerly.
+
+Usage:
+    python -m benchmarks.startup --budget-ms 1500 --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import NamedTuple
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+ENTRY_MODULE = 'app.main'
+# Modules that must only be imported on first use, never at worker boot
+DEFERRED_MODULES = ('markdown2', 'passlib', 'bcrypt')
+
+
+class ImportRecord(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(output: str) -> list[ImportRecord]:
+    records = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        records.append(ImportRecord(module.strip(), int(self_us), int(cumulative_us)))
+    return records
+
+
+def measure_once() -> list[ImportRecord]:
+    env = os.environ.copy()
+    # Settings() requires these, their values don't affect import time
+    env.setdefault('SECRET_KEY', 'benchmark')
+    env.setdefault('ALGORITHM', 'HS256')
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {ENTRY_MODULE}'],
+        cwd=ROOT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(completed.stderr)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--budget-ms', type=float, default=1500, help='Max median import time of app.main')
+    parser.add_argument('--runs', type=int, default=5, help='Number of measured runs')
+    parser.add_argument('--top', type=int, default=15, help='Number of slowest modules to report')
+    args = parser.parse_args()
+
+    # The first run compiles bytecode, it is not representative of a worker boot
+    measure_once()
+    runs = [measure_once() for _ in range(args.runs)]
+
+    totals_ms = []
+    for records in runs:
+        entry = next(record for record in records if record.module == ENTRY_MODULE)
+        totals_ms.append(entry.cumulative_us / 1000)
+    median_ms = statistics.median(totals_ms)
+
+    print(f'import {ENTRY_MODULE}: median {median_ms:.1f} ms, '
+          f'min {min(totals_ms):.1f} ms, max {max(totals_ms):.1f} ms over {args.runs} runs')
+    print('Slowest modules by self time (last run):')
+    for record in sorted(runs[-1], key=lambda r: r.self_us, reverse=True)[:args.top]:
+        print(f'  {record.self_us / 1000:8.1f} ms  {record.module}')
+
+    failed = False
+    imported = {record.module.split('.')[0] for record in runs[-1]}
+    eager = sorted(imported.intersection(DEFERRED_MODULES))
+    if eager:
+        print(f'FAIL: deferred modules imported at startup: {", ".join(eager)}')
+        failed = True
+    if median_ms > args.budget_ms:
+        print(f'FAIL: startup budget exceeded: {median_ms:.1f} ms > {args.budget_ms:.1f} ms')
+        failed = True
+    if not failed:
+        print(f'OK: within {args.budget_ms:.1f} ms budget')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
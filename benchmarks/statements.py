@@ -0,0 +1,107 @@
+"""
+Python-side query construction overhead: statements built per call (as the DAO used to)
+versus the prebuilt, bound-parameter statements returned by the DAO statement cache.
+
+Each measurement covers what happens in Python before SQL reaches the driver: building the
+construct and generating its cache key (used to look up the compiled SQL). No database is needed.
+
+Usage:
+    python -m benchmarks.statements --iterations 20000
+"""
+import argparse
+import sys
+import time
+from typing import Callable
+
+
+def measure(fn: Callable[[], object], iterations: int) -> float:
+    """Mean microseconds per call."""
+    for _ in range(min(100, iterations)):
+        fn()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=20_000)
+    args = parser.parse_args()
+
+    from benchmarks.common import configure_environment
+
+    configure_environment()
+
+    from sqlalchemy import select, func
+    from sqlalchemy.orm import joinedload, selectinload
+
+    from app.api.dao import BlogDAO
+    from app.api.models import Blog, Tag
+    from app.auth.dao import UsersDAO
+    from app.auth.models import User
+
+    def dynamic_blog_list(author_id: int | None, tag: str | None):
+        query = select(Blog).options(joinedload(Blog.user), selectinload(Blog.tags)).filter_by(status='published')
+        if author_id is not None:
+            query = query.filter_by(author=author_id)
+        if tag is not None:
+            query = query.filter(Blog.tags.any(Tag.name.ilike(f"%{tag.lower()}%")))
+        count_query = select(func.count()).select_from(query.subquery())
+        return count_query, query.offset(20).limit(10)
+
+    shapes = {
+        'user by id': (
+            lambda: select(User).filter_by(id=42),
+            lambda: UsersDAO._select_by({'id': 42})[0],
+        ),
+        'user by email': (
+            lambda: select(User).filter_by(email='user42@benchmark.com'),
+            lambda: UsersDAO._select_by({'email': 'user42@benchmark.com'})[0],
+        ),
+        'blog detail': (
+            lambda: select(Blog).options(joinedload(Blog.user), selectinload(Blog.tags)).filter_by(id=42),
+            lambda: BlogDAO._full_blog_info_statement(),
+        ),
+        'blog list': (
+            lambda: dynamic_blog_list(None, None),
+            lambda: BlogDAO._blog_list_statements(by_author=False, by_tag=False),
+        ),
+        'blog list by author': (
+            lambda: dynamic_blog_list(7, None),
+            lambda: BlogDAO._blog_list_statements(by_author=True, by_tag=False),
+        ),
+        'blog list by tag': (
+            lambda: dynamic_blog_list(None, 'python'),
+            lambda: BlogDAO._blog_list_statements(by_author=False, by_tag=True),
+        ),
+        'blog list by author+tag': (
+            lambda: dynamic_blog_list(7, 'python'),
+            lambda: BlogDAO._blog_list_statements(by_author=True, by_tag=True),
+        ),
+    }
+
+    def with_cache_keys(build: Callable[[], object]) -> Callable[[], None]:
+        def run() -> None:
+            statements = build()
+            for statement in statements if isinstance(statements, tuple) else (statements,):
+                statement._generate_cache_key()
+
+        return run
+
+    # Populate the statement cache
+    for _, cached in shapes.values():
+        cached()
+
+    header = f'{"query shape":<26}{"per call us":>14}{"cached us":>12}{"speedup":>10}'
+    print(header)
+    print('-' * len(header))
+    for name, (dynamic, cached) in shapes.items():
+        dynamic_us = measure(with_cache_keys(dynamic), args.iterations)
+        cached_us = measure(with_cache_keys(cached), args.iterations)
+        print(f'{name:<26}{dynamic_us:>14.1f}{cached_us:>12.1f}{dynamic_us / cached_us:>9.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())